@@ -0,0 +1,707 @@
+import argparse
+import contextlib
+import importlib.util
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import evaluador
+import generador_parser
+import lote
+import metricas
+import verificador
+import proyecto_final as backend
+
+# -------------------------------------------------
+# Benchmarks del analizador LL(1)
+# Uso: python benchmarks.py <benchmark> [opciones]
+# -------------------------------------------------
+
+# --- GENERADORES DE ENTRADAS SINTÉTICAS ---
+def generate_workload(n_tokens, max_depth=8, open_ratio=0.1, close_ratio=0.2, id_ratio=0.5, operators=None, seed=0):
+    """Genera una expresión válida con aproximadamente n_tokens tokens.
+
+    max_depth limita el anidamiento de paréntesis; open_ratio y close_ratio son las
+    probabilidades de abrir un paréntesis antes de un operando y de cerrarlo después;
+    id_ratio es la fracción de operandos que son identificadores (el resto, números);
+    operators asocia cada operador a su peso relativo (por defecto, todos iguales).
+    """
+    rng = random.Random(seed)
+    if operators is None:
+        choices, weights = ['+', '-', '*', '/', '%'], None
+    else:
+        choices, weights = list(operators), list(operators.values())
+    parts = []
+    count = 0
+    depth = 0
+    while count < n_tokens:
+        if depth < max_depth and rng.random() < open_ratio:
+            parts.append('(')
+            depth += 1
+            count += 1
+            continue
+        if rng.random() < id_ratio:
+            parts.append(f'var_{rng.randrange(1000)}')
+        else:
+            parts.append(str(rng.randrange(100000)))
+        count += 1
+        if depth and rng.random() < close_ratio:
+            parts.append(')')
+            depth -= 1
+            count += 1
+        parts.append(rng.choice(choices) if weights is None else rng.choices(choices, weights)[0])
+        count += 1
+    parts.append('1')
+    parts.extend(')' * depth)
+    return ' '.join(parts)
+
+def generate_expression(n_tokens, seed=0):
+    """Genera una expresión válida con aproximadamente n_tokens tokens (perfil por defecto)."""
+    return generate_workload(n_tokens, seed=seed)
+
+def generate_grammar(n_non_terminals, max_productions=3, max_length=4, epsilon_ratio=0.2, seed=0):
+    """Genera una gramática aleatoria (no necesariamente LL(1)) con ciclos entre no-terminales.
+
+    Usa los terminales del lexer para que las funciones originales también puedan procesarla.
+    """
+    rng = random.Random(seed)
+    non_terminals = [f"N{i}" for i in range(n_non_terminals)]
+    terminals = [t for t in backend.TOKEN_KINDS if t != backend.TOKEN_EOF]
+    grammar = {}
+    for nt in non_terminals:
+        productions = []
+        for _ in range(rng.randint(1, max_productions)):
+            if rng.random() < epsilon_ratio:
+                productions.append([backend.TOKEN_EPSILON])
+                continue
+            length = rng.randint(1, max_length)
+            productions.append([rng.choice(non_terminals) if rng.random() < 0.6 else rng.choice(terminals)
+                                for _ in range(length)])
+        grammar[nt] = productions
+    return grammar
+
+def generate_chain_grammar(levels, distinct_operators=False):
+    """Gramática de expresiones con `levels` niveles de precedencia encadenados.
+
+    Las dependencias forman una cadena larga (L0 -> L1 -> ... -> F), el peor caso
+    para un punto fijo que recorre todas las producciones en cada pasada. Con
+    `distinct_operators` cada nivel tiene su propio terminal OP<i> y la gramática es LL(1).
+    """
+    operators = [backend.TOKEN_PLUS, backend.TOKEN_MINUS, backend.TOKEN_MUL, backend.TOKEN_DIV, backend.TOKEN_MOD]
+    grammar = {}
+    for level in range(levels):
+        current, rest, following = f"L{level}", f"L{level}'", f"L{level + 1}" if level + 1 < levels else 'F'
+        operator = f"OP{level}" if distinct_operators else operators[level % len(operators)]
+        grammar[current] = [[following, rest]]
+        grammar[rest] = [[operator, following, rest], [backend.TOKEN_EPSILON]]
+    grammar['F'] = [[backend.TOKEN_LPAREN, 'L0', backend.TOKEN_RPAREN], [backend.TOKEN_NUM], [backend.TOKEN_ID]]
+    return grammar
+
+def generate_chain_tokens(levels, n_tokens, seed=0):
+    """Tokens válidos para generate_chain_grammar(levels, distinct_operators=True)."""
+    rng = random.Random(seed)
+    tokens = []
+    depth = 0
+    while len(tokens) < n_tokens:
+        if depth < 8 and rng.random() < 0.1:
+            tokens.append(backend.Token(backend.TOKEN_LPAREN, '(', len(tokens)))
+            depth += 1
+            continue
+        operand = backend.TOKEN_ID if rng.random() < 0.5 else backend.TOKEN_NUM
+        tokens.append(backend.Token(operand, '1', len(tokens)))
+        if depth and rng.random() < 0.2:
+            tokens.append(backend.Token(backend.TOKEN_RPAREN, ')', len(tokens)))
+            depth -= 1
+        tokens.append(backend.Token(f"OP{rng.randrange(levels)}", 'op', len(tokens)))
+    tokens.append(backend.Token(backend.TOKEN_ID, '1', len(tokens)))
+    tokens.extend(backend.Token(backend.TOKEN_RPAREN, ')', len(tokens)) for _ in range(depth))
+    tokens.append(backend.Token(backend.TOKEN_EOF, None, len(tokens)))
+    return tokens
+
+# --- UTILIDADES DE MEDICIÓN ---
+def best_of(func, repeat):
+    """Ejecuta func `repeat` veces y devuelve (mejor tiempo, último resultado)."""
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+class TokenList:
+    """Fuente de tokens ya materializados, para medir solo el parser."""
+    def __init__(self, tokens):
+        self.last = tokens[-1]
+        self.tokens = iter(tokens)
+
+    def get_next_token(self):
+        return next(self.tokens, self.last)
+
+def drain(lexer):
+    count = 0
+    while lexer.get_next_token().type != backend.TOKEN_EOF:
+        count += 1
+    return count + 1
+
+# --- BENCHMARKS ---
+def bench_lexer(args):
+    text = generate_expression(args.tokens)
+    print(f"Entrada: {len(text):,} caracteres")
+    print(f"{'LEXER':<30} | {'TOKENS':>10} | {'SEGUNDOS':>9} | TOKENS/S")
+    print("-" * 70)
+    cases = [
+        ("CharLexer.get_next_token", lambda: drain(backend.CharLexer(text))),
+        ("Lexer.get_next_token", lambda: drain(backend.Lexer(text))),
+        ("Lexer.tokenize", lambda: len(backend.Lexer(text).tokenize())),
+    ]
+    for name, func in cases:
+        seconds, count = best_of(func, args.repeat)
+        print(f"{name:<30} | {count:>10,} | {seconds:>9.3f} | {count / seconds:,.0f}")
+
+def bench_grammar(args):
+    print(f"{'FORMA':<9} | {'NO-TERMINALES':>13} | {'FIRST orig (s)':>14} | {'FIRST grafo (s)':>15} | {'FOLLOW orig (s)':>15} | {'FOLLOW grafo (s)':>16}")
+    print("-" * 98)
+    for shape in ('aleatoria', 'cadena'):
+        for n in args.sizes:
+            grammar = generate_grammar(n, seed=n) if shape == 'aleatoria' else generate_chain_grammar(n // 2)
+            non_terminals = set(grammar)
+            start = next(iter(grammar))
+            naive_first_s, naive_first = best_of(lambda: backend.calculate_first_sets_naive(grammar, non_terminals), args.repeat)
+            first_s, first_sets = best_of(lambda: backend.calculate_first_sets(grammar, non_terminals), args.repeat)
+            naive_follow_s, naive_follow = best_of(lambda: backend.calculate_follow_sets_naive(grammar, start, naive_first), args.repeat)
+            follow_s, follow_sets = best_of(lambda: backend.calculate_follow_sets(grammar, start, first_sets), args.repeat)
+            assert naive_first == first_sets and naive_follow == follow_sets, "Los resultados no coinciden"
+            print(f"{shape:<9} | {len(grammar):>13,} | {naive_first_s:>14.4f} | {first_s:>15.4f} | {naive_follow_s:>15.4f} | {follow_s:>16.4f}")
+
+def build_table():
+    first_sets = backend.calculate_first_sets(backend.GRAMMAR, backend.NON_TERMINALS)
+    follow_sets = backend.calculate_follow_sets(backend.GRAMMAR, backend.START_SYMBOL, first_sets)
+    return backend.build_ll1_table(backend.GRAMMAR, first_sets, follow_sets)
+
+def bench_parse(args):
+    text = generate_expression(args.tokens)
+    grammar = backend.compile_grammar(build_table(), backend.START_SYMBOL)
+    tokens = backend.Lexer(text).tokenize_buffer()
+    n_tokens = len(tokens)
+    token_list = backend.Lexer(text).tokenize()
+
+    def run(trace=None):
+        tokens.rewind()
+        return backend.LL1Parser(grammar, tokens, backend.START_SYMBOL).parse(trace)
+
+    def formatted(lines):
+        return lambda stack, token, action: lines.append(backend.format_trace_event(stack, token, action))
+
+    print(f"{'MODO':<30} | {'SEGUNDOS':>9} | TOKENS/S")
+    print("-" * 60)
+    cases = [
+        ("sin traza (list[Token])", lambda: backend.LL1Parser(grammar, TokenList(token_list), backend.START_SYMBOL).parse()),
+        ("sin traza (TokenBuffer)", lambda: run()),
+        ("traza a callback vacío", lambda: run(lambda stack, token, action: None)),
+        ("traza formateada", lambda: run(formatted([]))),
+    ]
+    for name, func in cases:
+        seconds, _ = best_of(func, args.repeat)
+        print(f"{name:<30} | {seconds:>9.3f} | {n_tokens / seconds:,.0f}")
+
+def import_generated_parser(compiled, directory, name):
+    filename = generador_parser.write_parser_module(compiled, os.path.join(directory, f"{name}.py"))
+    spec = importlib.util.spec_from_file_location(name, filename)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def bench_codegen(args):
+    expression_tokens = backend.Lexer(generate_expression(args.tokens)).tokenize()
+    chain_levels = 20
+    chain_tokens = generate_chain_tokens(chain_levels, args.tokens)
+    workloads = [
+        ("expresiones", backend.Grammar(backend.GRAMMAR, backend.START_SYMBOL), expression_tokens),
+        (f"cadena ({chain_levels} niveles)", backend.Grammar(generate_chain_grammar(chain_levels, distinct_operators=True)), chain_tokens),
+    ]
+    print(f"{'GRAMÁTICA':<22} | {'PARSER':<18} | {'SEGUNDOS':>9} | {'TOKENS/S':>11} | ACELERACIÓN")
+    print("-" * 80)
+    with tempfile.TemporaryDirectory() as tmp:
+        for index, (name, grammar, tokens) in enumerate(workloads):
+            compiled = grammar.compile(sparse=False)
+            generated = import_generated_parser(compiled, tmp, f"parser_generado_{index}")
+            table_s, _ = best_of(lambda: backend.LL1Parser(compiled, TokenList(tokens), grammar.start_symbol).parse(), args.repeat)
+            generated_s, _ = best_of(lambda: generated.Parser(TokenList(tokens)).parse(), args.repeat)
+            for label, seconds in (("LL1Parser (tabla)", table_s), ("generado", generated_s)):
+                print(f"{name:<22} | {label:<18} | {seconds:>9.3f} | {len(tokens) / seconds:>11,.0f} | {table_s / seconds:.2f}x")
+
+def bench_evaluate(args):
+    formula = "(valor1 + 100) * 2 % 5 - otra_variable / 3"
+    ast = evaluador.parse_expression(formula)
+    rng = random.Random(0)
+    rows = args.rows
+    valor1 = [rng.uniform(-1000, 1000) for _ in range(rows)]
+    otra_variable = [rng.uniform(-1000, 1000) for _ in range(rows)]
+
+    def per_row():
+        return [evaluador.evaluate(ast, {'valor1': a, 'otra_variable': b}) for a, b in zip(valor1, otra_variable)]
+
+    print(f"Fórmula: {formula} | filas: {rows:,}")
+    print(f"{'EVALUACIÓN':<30} | {'SEGUNDOS':>9} | {'FILAS/S':>13} | ACELERACIÓN")
+    print("-" * 72)
+    row_s, expected = best_of(per_row, 1)
+    print(f"{'Python fila por fila':<30} | {row_s:>9.3f} | {rows / row_s:>13,.0f} | 1.00x")
+    if evaluador.np is None:
+        print("NumPy no está instalado: se omite evaluate_columns()")
+        return
+    columns = {'valor1': evaluador.np.array(valor1), 'otra_variable': evaluador.np.array(otra_variable)}
+    vector_s, result = best_of(lambda: evaluador.evaluate_columns(ast, columns), args.repeat)
+    assert evaluador.np.allclose(result, expected), "Los resultados no coinciden"
+    print(f"{'NumPy por columnas':<30} | {vector_s:>9.3f} | {rows / vector_s:>13,.0f} | {row_s / vector_s:.0f}x")
+
+def bench_cache(args):
+    # Fórmulas cortas y distintas, como las que repite un servicio (variables var_0..var_999)
+    formulas = [generate_expression(args.formula_tokens, seed) for seed in range(args.formulas)]
+    env = {f'var_{i}': float(i + 1) for i in range(1000)}
+    lookups = [formulas[i % len(formulas)] for i in range(args.tokens // 10)]
+    cache = evaluador.ExpressionCache(maxsize=len(formulas))
+
+    def reparse():
+        compiled = evaluador.get_compiled_grammar()
+        for text in lookups:
+            ast = backend.LL1Parser(compiled, backend.Lexer(text), backend.START_SYMBOL).parse_ast()
+            try:
+                evaluador.evaluate(ast, env)
+            except ZeroDivisionError:  # las fórmulas aleatorias pueden dividir por cero
+                pass
+
+    def cached():
+        get = cache.get
+        for text in lookups:
+            try:
+                get(text)(env)
+            except ZeroDivisionError:
+                pass
+
+    def cached_lookup():
+        get = cache.get
+        for text in lookups:
+            get(text)
+
+    print(f"{len(formulas):,} fórmulas de ~{args.formula_tokens} tokens, {len(lookups):,} evaluaciones")
+    print(f"{'CAMINO':<38} | {'µs/EVAL':>8} | ACELERACIÓN")
+    print("-" * 64)
+    start = time.perf_counter()
+    for text in formulas:
+        cache.get(text)
+    cold = (time.perf_counter() - start) / len(formulas)
+    base, _ = best_of(reparse, args.repeat)
+    base /= len(lookups)
+    print(f"{'Lexer + LL1Parser + evaluate()':<38} | {base * 1e6:>8.2f} | 1.00x")
+    print(f"{'Compilación (fallo de caché)':<38} | {cold * 1e6:>8.2f} | {base / cold:.2f}x")
+    for label, func in (("Acierto: solo búsqueda", cached_lookup), ("Acierto: búsqueda + llamada", cached)):
+        elapsed, _ = best_of(func, args.repeat)
+        elapsed /= len(lookups)
+        print(f"{label:<38} | {elapsed * 1e6:>8.2f} | {base / elapsed:.1f}x")
+    print(cache.stats())
+
+def bench_batch(args):
+    items = [(i, generate_expression(args.formula_tokens, i)) for i in range(args.tokens // 10)]
+    cpus = os.cpu_count() or 1
+    counts = sorted({1, 2, cpus})
+    print(f"{len(items):,} expresiones de ~{args.formula_tokens} tokens, CPUs: {cpus}")
+    print(f"{'PROCESOS':>8} | {'SEGUNDOS':>9} | {'EXPR/S':>10} | ACELERACIÓN")
+    print("-" * 50)
+    base = None
+    for workers in counts:
+        elapsed, results = best_of(lambda: list(lote.parse_batch(items, workers)), args.repeat)
+        assert len(results) == len(items)
+        base = base or elapsed
+        print(f"{workers:>8} | {elapsed:>9.3f} | {len(items) / elapsed:>10,.0f} | {base / elapsed:.2f}x")
+
+def bench_statements(args):
+    text = "\n".join(generate_expression(args.formula_tokens, i) for i in range(args.tokens // 10))
+    cpus = os.cpu_count() or 1
+    scan_s, statements = best_of(lambda: sum(1 for _ in lote.statement_spans(text)), args.repeat)
+    print(f"{statements:,} sentencias, {len(text) / 1e6:.1f} MB, CPUs: {cpus}")
+    print(f"Búsqueda de cortes (sin tokenizar): {scan_s:.3f} s")
+    print(f"{'PROCESOS':>8} | {'SEGUNDOS':>9} | {'SENTENCIAS/S':>13} | ACELERACIÓN")
+    print("-" * 52)
+    base = None
+    for workers in sorted({1, 2, cpus}):
+        elapsed, _ = best_of(lambda: list(lote.parse_statements(text, workers)), args.repeat)
+        base = base or elapsed
+        print(f"{workers:>8} | {elapsed:>9.3f} | {statements / elapsed:>13,.0f} | {base / elapsed:.2f}x")
+
+def bench_recovery(args):
+    tables = backend.load_grammar_tables(write_json=False)
+    lines = [generate_expression(args.formula_tokens, i) for i in range(args.lines)]
+    clean = " +\n".join(lines)
+    # Un error cada ~1000 líneas: operador duplicado, caracter inválido o paréntesis de más
+    rng = random.Random(0)
+    broken = list(lines)
+    for i in range(0, len(broken), 1000):
+        broken[i] = rng.choice(["* ", "$ ", ") "]) + broken[i]
+    text = " +\n".join(broken)
+
+    def recover(source):
+        parser = backend.LL1Parser(tables.compiled, backend.Lexer(source), backend.START_SYMBOL)
+        return parser.parse_with_recovery(tables.follow_sets, max_errors=len(lines))
+
+    def parse_once():
+        return backend.LL1Parser(tables.compiled, backend.Lexer(clean), backend.START_SYMBOL).parse()
+
+    parse_s, _ = best_of(parse_once, args.repeat)
+    clean_s, none = best_of(lambda: recover(clean), args.repeat)
+    assert not none
+    recovery_s, errors = best_of(lambda: recover(text), args.repeat)
+    print(f"{len(lines):,} líneas, {len(text) / 1e6:.1f} MB, {len(errors)} errores encontrados en una pasada")
+    print(f"parse() sobre la entrada correcta:             {parse_s:.3f} s")
+    print(f"parse_with_recovery() sobre la entrada correcta: {clean_s:.3f} s")
+    print(f"parse_with_recovery() con errores:             {recovery_s:.3f} s")
+    print(f"Corregir y reintentar (un parse() por error):  ~{parse_s * len(errors) / 2:.1f} s "
+          f"(en promedio cada reintento llega a la mitad del archivo)")
+
+def bench_incremental(args):
+    compiled = backend.load_grammar_tables(write_json=False).compiled
+    text = " +\n".join(generate_expression(args.formula_tokens, i) for i in range(args.lines))
+    start = time.perf_counter()
+    checker = verificador.IncrementalChecker(compiled, text)
+    full = time.perf_counter() - start
+    print(f"{args.lines:,} líneas, {len(text) / 1e6:.1f} MB")
+    print(f"Análisis completo (IncrementalChecker nuevo): {full * 1000:.1f} ms")
+
+    # Ediciones de un caracter en posiciones al azar: insertar, borrar o reemplazar
+    rng = random.Random(0)
+    latencies = []
+    relexed = []
+    for _ in range(args.edits):
+        pos = rng.randrange(len(text))
+        char = rng.choice("abc123 +-*/()")
+        edit = rng.randrange(3)
+        if edit == 0:
+            text = text[:pos] + char + text[pos:]
+        elif edit == 1:
+            text = text[:pos] + text[pos + 1:]
+        else:
+            text = text[:pos] + char + text[pos + 1:]
+        start = time.perf_counter()
+        checker.update(text)
+        latencies.append(time.perf_counter() - start)
+        relexed.append(checker.relexed)
+    latencies.sort()
+    relexed.sort()
+    percentile = lambda values, p: values[min(len(values) - 1, int(len(values) * p))]
+    print(f"{args.edits} ediciones de un caracter:")
+    print(f"  latencia p50 {percentile(latencies, 0.5) * 1000:.2f} ms | p99 {percentile(latencies, 0.99) * 1000:.2f} ms"
+          f" | máx {latencies[-1] * 1000:.2f} ms")
+    print(f"  tokens reanalizados p50 {percentile(relexed, 0.5)} | p99 {percentile(relexed, 0.99)} | máx {relexed[-1]}")
+    fresh = verificador.IncrementalChecker(compiled, text)
+    assert list(fresh.tokens()) == list(checker.tokens()), "El estado incremental difiere del análisis completo"
+    assert [str(e) for e in fresh.errors()] == [str(e) for e in checker.errors()]
+
+def bench_metrics(args):
+    compiled = backend.load_grammar_tables(write_json=False).compiled
+    text = generate_expression(args.tokens)
+    n_tokens = len(backend.Lexer(text).tokenize_buffer())
+
+    def run(metrics=None):
+        return backend.LL1Parser(compiled, backend.Lexer(text), backend.START_SYMBOL).parse(metrics=metrics)
+
+    metrics = metricas.ParseMetrics(compiled)
+    cases = [
+        ("sin métricas", lambda: run()),
+        ("con ParseMetrics", lambda: run(metrics)),
+        ("con ParseMetrics + cProfile", lambda: run(metricas.ParseMetrics(compiled, profile='cprofile'))),
+    ]
+    print(f"{'MODO':<30} | {'SEGUNDOS':>9} | {'TOKENS/S':>11} | COSTO")
+    print("-" * 66)
+    base = None
+    for name, func in cases:
+        seconds, _ = best_of(func, args.repeat)
+        base = base or seconds
+        print(f"{name:<30} | {seconds:>9.3f} | {n_tokens / seconds:>11,.0f} | {seconds / base:.2f}x")
+    data = metrics.as_dict()
+    print(f"Lexer {data['lexer_seconds'] / metrics.parses:.3f} s | parser {data['parser_seconds'] / metrics.parses:.3f} s"
+          f" por análisis | pila máxima {data['max_stack_depth']}")
+
+def dict_table_size(table):
+    """Bytes de la tabla dict de dicts (los diccionarios; las producciones se comparten)."""
+    return sys.getsizeof(table) + sum(sys.getsizeof(row) for row in table.values())
+
+def bench_table(args):
+    print(f"{'NIVELES':>7} | {'FORMATO':<26} | {'TAMAÑO (KB)':>11} | {'ns/CONSULTA':>11}")
+    print("-" * 66)
+    for levels in args.sizes:
+        grammar = backend.Grammar(generate_chain_grammar(levels, distinct_operators=True))
+        table = grammar.ll1_table()
+        compiled = backend.compile_grammar(table, grammar.start_symbol)
+        rng = random.Random(levels)
+        # Consultas a casillas válidas, como las que hace el parser en una entrada correcta
+        cells = [(nt, terminal) for nt, row in table.items() for terminal in row]
+        queries = [rng.choice(cells) for _ in range(100_000)]
+        ids = compiled.symbol_id
+        n_terminals, stride = compiled.n_terminals, compiled.stride
+        rows = [(ids[nt] - n_terminals, ids[terminal]) for nt, terminal in queries]
+        flat_queries = [row * stride + column for row, column in rows]
+        sparse = backend.compress_table(compiled.table, stride)
+        reduced = backend.compress_table(compiled.table, stride, default_reduction=True)
+        cases = [
+            ("dict de dicts", dict_table_size(table), lambda: [table[nt][t] for nt, t in queries]),
+            ("array plano", len(compiled.table) * compiled.table.itemsize,
+             lambda: [compiled.table[i] for i in flat_queries]),
+            ("comprimida", sparse.nbytes(), lambda: [sparse.lookup(r, c) for r, c in rows]),
+            ("comprimida + por defecto", reduced.nbytes(), lambda: [reduced.lookup(r, c) for r, c in rows]),
+        ]
+        for name, size, func in cases:
+            seconds, _ = best_of(func, args.repeat)
+            print(f"{levels:>7,} | {name:<26} | {size / 1024:>11.1f} | {seconds / len(queries) * 1e9:>11.1f}")
+
+def traced_peak(func):
+    """Devuelve (memoria retenida, pico) en bytes medidos con tracemalloc."""
+    tracemalloc.start()
+    result = func()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return current, peak
+
+def bench_memory(args):
+    text = generate_expression(args.tokens)
+    print(f"Entrada: {len(text):,} caracteres, ~{args.tokens:,} tokens")
+    print(f"{'REPRESENTACIÓN':<30} | {'RETENIDA (MB)':>13} | {'PICO (MB)':>10} | BYTES/TOKEN")
+    print("-" * 75)
+    cases = [
+        ("list[Token] (tokenize)", lambda: backend.Lexer(text).tokenize()),
+        ("TokenBuffer (tokenize_buffer)", lambda: backend.Lexer(text).tokenize_buffer()),
+    ]
+    for name, func in cases:
+        current, peak = traced_peak(func)
+        print(f"{name:<30} | {current / 2**20:>13.1f} | {peak / 2**20:>10.1f} | {current / args.tokens:.1f}")
+
+# Se ejecuta en un proceso aparte; VmHWM es el pico de RSS de ese proceso (Linux)
+RSS_SCRIPT = '''
+import sys
+import proyecto_final as backend
+mode, filename = sys.argv[1], sys.argv[2]
+if mode == 'read':
+    lexer = backend.Lexer(backend.read_source_file(filename))
+    count = 0
+    while lexer.get_next_token().type != backend.TOKEN_EOF:
+        count += 1
+else:
+    with backend.open_source_stream(filename, use_mmap=(mode == 'mmap')) as lexer:
+        count = 0
+        while lexer.get_next_token().type != backend.TOKEN_EOF:
+            count += 1
+with open('/proc/self/status') as status:
+    print(next(line.split()[1] for line in status if line.startswith('VmHWM')))
+'''
+
+def bench_stream(args):
+    print(f"{'TOKENS':>10} | {'ARCHIVO (MB)':>12} | {'read (MB)':>9} | {'stream (MB)':>11} | {'mmap (MB)':>9}")
+    print("-" * 65)
+    here = os.path.dirname(os.path.abspath(__file__))
+    for factor in (1, 4, 16):
+        n_tokens = args.tokens * factor
+        with tempfile.TemporaryDirectory() as tmp:
+            filename = os.path.join(tmp, 'entrada.txt')
+            with open(filename, 'w', encoding='utf-8') as f:
+                f.write(generate_expression(n_tokens))
+            size = os.path.getsize(filename)
+            peaks = []
+            for mode in ('read', 'stream', 'mmap'):
+                output = subprocess.run([sys.executable, '-c', RSS_SCRIPT, mode, filename],
+                                        cwd=here, capture_output=True, text=True, check=True).stdout
+                peaks.append(int(output) / 1024)  # VmHWM viene en KiB
+        print(f"{n_tokens:>10,} | {size / 2**20:>12.1f} | {peaks[0]:>9.1f} | {peaks[1]:>11.1f} | {peaks[2]:>9.1f}")
+
+STARTUP_SCRIPT = '''
+import sys, time
+start = time.perf_counter()
+sys.path.insert(0, sys.argv[1])
+import proyecto_final as backend
+imported = time.perf_counter()
+backend.load_grammar_tables()
+print(imported - start, time.perf_counter() - imported)
+'''
+
+def bench_startup(args):
+    here = os.path.dirname(os.path.abspath(__file__))
+    print(f"{'ARRANQUE':<10} | {'IMPORT (ms)':>11} | {'TABLAS (ms)':>11} | {'TOTAL (ms)':>10}")
+    print("-" * 52)
+    with tempfile.TemporaryDirectory() as tmp:
+        # Primer arranque con caché vacía (frío) y luego los siguientes (caliente)
+        for label in ('frío', 'caliente', 'caliente'):
+            output = subprocess.run([sys.executable, '-c', STARTUP_SCRIPT, here],
+                                    cwd=tmp, capture_output=True, text=True, check=True).stdout
+            import_s, tables_s = map(float, output.split()[-2:])
+            print(f"{label:<10} | {import_s * 1000:>11.2f} | {tables_s * 1000:>11.2f} | {(import_s + tables_s) * 1000:>10.2f}")
+
+# --- SUITE CON RESULTADOS EN JSON Y COMPARACIÓN CONTRA UNA BASE ---
+# Perfiles de entrada de la suite (parámetros de generate_workload)
+WORKLOADS = {
+    'mixta': {},
+    'profunda': {'max_depth': 64, 'open_ratio': 0.3, 'close_ratio': 0.1},
+    'identificadores': {'id_ratio': 0.95},
+    'multiplicativa': {'operators': {'+': 1, '-': 1, '*': 4, '/': 4, '%': 2}},
+}
+# Gramáticas sintéticas para los generadores (no-terminales)
+SUITE_GRAMMAR_SIZES = (1000,)
+DEFAULT_THRESHOLD = 0.10
+
+def machine_metadata():
+    """Datos de la máquina y del código con que se midió."""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        'fecha': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'python': platform.python_version(),
+        'implementacion': platform.python_implementation(),
+        'plataforma': platform.platform(),
+        'maquina': platform.machine(),
+        'procesador': platform.processor() or None,
+        'cpus': os.cpu_count(),
+        'commit': commit,
+    }
+
+def count_parse_steps(compiled, tokens):
+    """Pasos del parser (matches más expansiones) para una entrada, contados con la traza."""
+    steps = 0
+    def count(stack, token, action):
+        nonlocal steps
+        steps += 1
+    tokens.rewind()
+    backend.LL1Parser(compiled, tokens, backend.START_SYMBOL).parse(trace=count)
+    return steps
+
+def run_suite(args):
+    """Mide cada etapa y devuelve {nombre: {'value', 'unit', 'higher_is_better'}}."""
+    results = {}
+
+    def record(name, value, unit, higher_is_better=True):
+        results[name] = {'value': value, 'unit': unit, 'higher_is_better': higher_is_better}
+        print(f"{name:<40} {value:>16,.4f} {unit}", file=sys.stderr)
+
+    compiled = backend.load_grammar_tables(write_json=False).compiled
+    for name, params in WORKLOADS.items():
+        text = generate_workload(args.tokens, **params)
+        lexer_s, tokens = best_of(lambda: backend.Lexer(text).tokenize_buffer(), args.repeat)
+        record(f"lexer/{name}", len(tokens) / lexer_s, 'tokens/s')
+
+        def parse():
+            tokens.rewind()
+            return backend.LL1Parser(compiled, tokens, backend.START_SYMBOL).parse()
+        parse_s, _ = best_of(parse, args.repeat)
+        record(f"parse/{name}", count_parse_steps(compiled, tokens) / parse_s, 'pasos/s')
+
+    for n in SUITE_GRAMMAR_SIZES:
+        for shape, grammar in (('aleatoria', generate_grammar(n, seed=n)), ('cadena', generate_chain_grammar(n // 2))):
+            non_terminals = set(grammar)
+            start = next(iter(grammar))
+            first_s, first_sets = best_of(lambda: backend.calculate_first_sets(grammar, non_terminals), args.repeat)
+            follow_s, follow_sets = best_of(lambda: backend.calculate_follow_sets(grammar, start, first_sets), args.repeat)
+            # La gramática aleatoria no es LL(1): se descartan los avisos de conflicto
+            with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+                table_s, _ = best_of(lambda: backend.build_ll1_table(grammar, first_sets, follow_sets), args.repeat)
+            record(f"first/{shape}-{n}", first_s * 1000, 'ms', False)
+            record(f"follow/{shape}-{n}", follow_s * 1000, 'ms', False)
+            record(f"tabla/{shape}-{n}", table_s * 1000, 'ms', False)
+    return results
+
+def load_results(filename):
+    with open(filename, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def compare_results(baseline, current, threshold=DEFAULT_THRESHOLD):
+    """Compara dos ejecuciones de la suite; devuelve filas (nombre, base, actual, cambio, regresión).
+
+    El cambio es positivo cuando mejora. Es regresión si empeora más que `threshold`.
+    """
+    rows = []
+    for name, base in baseline['results'].items():
+        if name not in current['results']:
+            continue
+        value = current['results'][name]['value']
+        if base['higher_is_better']:
+            change = value / base['value'] - 1
+        else:
+            change = base['value'] / value - 1
+        rows.append((name, base['value'], value, base['unit'], change, change < -threshold))
+    return rows
+
+def bench_suite(args):
+    report = {
+        'metadata': machine_metadata(),
+        'parameters': {'tokens': args.tokens, 'repeat': args.repeat, 'workloads': WORKLOADS,
+                       'grammar_sizes': list(SUITE_GRAMMAR_SIZES)},
+        'results': run_suite(args),
+    }
+    if args.out:
+        with open(args.out, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=4, ensure_ascii=False)
+        print(f"Resultados guardados en {args.out}", file=sys.stderr)
+    return report
+
+def bench_compare(args):
+    if not args.baseline:
+        sys.exit("compare requiere --baseline resultados.json")
+    baseline = load_results(args.baseline)
+    current = load_results(args.current) if args.current else bench_suite(args)
+    rows = compare_results(baseline, current, args.threshold)
+    print(f"Base: {baseline['metadata'].get('commit')} ({baseline['metadata'].get('fecha')}) | "
+          f"actual: {current['metadata'].get('commit')} ({current['metadata'].get('fecha')})")
+    print(f"{'MEDICIÓN':<28} | {'BASE':>14} | {'ACTUAL':>14} | {'UNIDAD':<9} | CAMBIO")
+    print("-" * 86)
+    regressions = 0
+    for name, base, value, unit, change, regression in rows:
+        regressions += regression
+        flag = "  << REGRESIÓN" if regression else ""
+        print(f"{name:<28} | {base:>14,.2f} | {value:>14,.2f} | {unit:<9} | {change:+.1%}{flag}")
+    if regressions:
+        print(f"\n{regressions} regresión(es) por sobre el umbral de {args.threshold:.0%}")
+        sys.exit(1)
+    print(f"\nSin regresiones por sobre el umbral de {args.threshold:.0%}")
+
+BENCHMARKS = {
+    'batch': bench_batch,
+    'cache': bench_cache,
+    'codegen': bench_codegen,
+    'compare': bench_compare,
+    'evaluate': bench_evaluate,
+    'grammar': bench_grammar,
+    'incremental': bench_incremental,
+    'lexer': bench_lexer,
+    'memory': bench_memory,
+    'metrics': bench_metrics,
+    'parse': bench_parse,
+    'recovery': bench_recovery,
+    'startup': bench_startup,
+    'statements': bench_statements,
+    'suite': bench_suite,
+    'stream': bench_stream,
+    'table': bench_table,
+}
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmarks del analizador LL(1)")
+    parser.add_argument('benchmark', choices=sorted(BENCHMARKS))
+    parser.add_argument('--tokens', type=int, default=200_000, help="Tamaño aproximado de la entrada")
+    parser.add_argument('--repeat', type=int, default=3, help="Repeticiones (se reporta la mejor)")
+    parser.add_argument('--rows', type=int, default=1_000_000, help="Filas por columna (benchmark evaluate)")
+    parser.add_argument('--formulas', type=int, default=2000, help="Fórmulas distintas (benchmark cache)")
+    parser.add_argument('--formula-tokens', type=int, default=25, help="Tokens por fórmula (benchmark cache)")
+    parser.add_argument('--lines', type=int, default=100_000, help="Líneas del archivo (benchmarks recovery e incremental)")
+    parser.add_argument('--edits', type=int, default=500, help="Ediciones a aplicar (benchmark incremental)")
+    parser.add_argument('--out', help="Archivo JSON donde guardar los resultados (suite)")
+    parser.add_argument('--baseline', help="Resultados JSON de referencia (compare)")
+    parser.add_argument('--current', help="Resultados JSON a comparar; si se omite, se ejecuta la suite (compare)")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD, help="Empeoramiento relativo tolerado (compare)")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1000, 4000], help="Cantidad de no-terminales (benchmark grammar)")
+    args = parser.parse_args()
+    BENCHMARKS[args.benchmark](args)
@@ -0,0 +1,155 @@
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from collections import deque
+
+# -------------------------------------------------
+# Cliente del servidor de análisis y prueba de carga
+# Uso: python cliente.py [--socket ruta] validate "(a + 1) * 2"
+#      python cliente.py [--socket ruta] carga --peticiones 20000 --conexiones 4 --pipeline 32
+# -------------------------------------------------
+
+# Los mismos valores que servidor.py; se repiten para no importar el parser en el cliente
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+MAX_LINE = 16 * 1024 * 1024
+
+class ParseClient:
+    """Conexión al servidor. Admite varias peticiones en vuelo: las respuestas llegan
+    en orden, así que cada una resuelve el futuro más antiguo pendiente."""
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.waiting = deque()
+        self.next_id = 0
+        self.receiver = asyncio.create_task(self.receive())
+
+    @classmethod
+    async def connect(cls, host=DEFAULT_HOST, port=DEFAULT_PORT, socket_path=None):
+        if socket_path:
+            reader, writer = await asyncio.open_unix_connection(socket_path, limit=MAX_LINE)
+        else:
+            reader, writer = await asyncio.open_connection(host, port, limit=MAX_LINE)
+        return cls(reader, writer)
+
+    async def receive(self):
+        while True:
+            line = await self.reader.readline()
+            if not line:
+                break
+            self.waiting.popleft().set_result(json.loads(line))
+        while self.waiting:
+            self.waiting.popleft().set_exception(ConnectionError("El servidor cerró la conexión"))
+
+    def send(self, op, text=None, **fields):
+        """Envía una petición sin esperar; devuelve un futuro con la respuesta."""
+        self.next_id += 1
+        request = {'id': self.next_id, 'op': op, 'text': text, **fields}
+        future = asyncio.get_running_loop().create_future()
+        self.waiting.append(future)
+        self.writer.write(json.dumps(request).encode('ascii') + b"\n")
+        return future
+
+    async def request(self, op, text=None, **fields):
+        future = self.send(op, text, **fields)
+        await self.writer.drain()
+        return await future
+
+    async def close(self):
+        self.writer.close()
+        await self.writer.wait_closed()
+        await self.receiver
+
+def percentile(values, p):
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+async def load_test(connect, requests, connections, pipeline, expressions, op):
+    """Reparte `requests` peticiones entre `connections` conexiones con hasta `pipeline`
+    en vuelo por conexión; devuelve (latencias en segundos, duración total, errores)."""
+    latencies = []
+    errors = 0
+    per_connection = [requests // connections + (i < requests % connections) for i in range(connections)]
+
+    async def worker(count, seed):
+        nonlocal errors
+        rng = random.Random(seed)
+        client = await connect()
+        in_flight = deque()
+        for _ in range(count):
+            if len(in_flight) >= pipeline:
+                start, future = in_flight.popleft()
+                response = await future
+                latencies.append(time.perf_counter() - start)
+                errors += not response['ok']
+            in_flight.append((time.perf_counter(), client.send(op, rng.choice(expressions), env={})))
+            await client.writer.drain()
+        while in_flight:
+            start, future = in_flight.popleft()
+            response = await future
+            latencies.append(time.perf_counter() - start)
+            errors += not response['ok']
+        await client.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(count, i) for i, count in enumerate(per_connection)))
+    return sorted(latencies), time.perf_counter() - start, errors
+
+def sample_expressions(count, seed=0):
+    """Expresiones cortas de prueba, como las que envía un servicio."""
+    rng = random.Random(seed)
+    operators = ['+', '-', '*', '/', '%']
+    expressions = []
+    for _ in range(count):
+        terms = [str(rng.randrange(1, 1000)) if rng.random() < 0.7 else f"({rng.randrange(1, 100)} + 1)"
+                 for _ in range(rng.randrange(2, 8))]
+        text = terms[0]
+        for term in terms[1:]:
+            text += f" {rng.choice(operators)} {term}"
+        expressions.append(text)
+    return expressions
+
+# --- EJECUCIÓN PRINCIPAL ---
+if __name__ == '__main__':
+    arg_parser = argparse.ArgumentParser(description="Cliente y prueba de carga del servidor LL(1)")
+    arg_parser.add_argument('--socket', help="Ruta del socket Unix del servidor")
+    arg_parser.add_argument('--host', default=DEFAULT_HOST)
+    arg_parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    commands = arg_parser.add_subparsers(dest='command', required=True)
+    for op in ('validate', 'parse', 'evaluate'):
+        command = commands.add_parser(op, help=f"Envía una petición '{op}'")
+        command.add_argument('texto')
+        if op == 'evaluate':
+            command.add_argument('--env', default='{}', help="Variables como objeto JSON")
+    commands.add_parser('stats', help="Estadísticas del servidor")
+    load = commands.add_parser('carga', help="Prueba de carga: latencia p50/p99 y peticiones/s")
+    load.add_argument('--peticiones', type=int, default=20000)
+    load.add_argument('--conexiones', type=int, default=4)
+    load.add_argument('--pipeline', type=int, default=32, help="Peticiones en vuelo por conexión")
+    load.add_argument('--op', default='validate', choices=('validate', 'parse', 'evaluate'))
+    args = arg_parser.parse_args()
+
+    def connect():
+        return ParseClient.connect(args.host, args.port, args.socket)
+
+    async def main():
+        if args.command == 'carga':
+            expressions = sample_expressions(1000)
+            latencies, elapsed, errors = await load_test(connect, args.peticiones, args.conexiones,
+                                                         args.pipeline, expressions, args.op)
+            print(f"{len(latencies):,} peticiones '{args.op}' en {elapsed:.3f} s "
+                  f"({args.conexiones} conexiones, pipeline {args.pipeline}): {len(latencies) / elapsed:,.0f} pet/s")
+            print(f"latencia p50 {percentile(latencies, 0.5) * 1000:.2f} ms | p99 {percentile(latencies, 0.99) * 1000:.2f} ms"
+                  f" | máx {latencies[-1] * 1000:.2f} ms | errores {errors}")
+            return
+        client = await connect()
+        fields = {'env': json.loads(args.env)} if args.command == 'evaluate' else {}
+        response = await client.request(args.command, getattr(args, 'texto', None), **fields)
+        await client.close()
+        print(json.dumps(response, ensure_ascii=False))
+        if not response['ok']:
+            sys.exit(1)
+
+    asyncio.run(main())
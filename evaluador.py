@@ -0,0 +1,273 @@
+import math
+import operator
+import threading
+from collections import OrderedDict
+
+import proyecto_final as backend
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional: solo lo necesita evaluate_columns()
+    np = None
+
+# -------------------------------------------------
+# Evaluación de expresiones sobre el AST de LL1Parser.parse_ast()
+# -------------------------------------------------
+
+OPERATORS = {
+    '+': operator.add,
+    '-': operator.sub,
+    '*': operator.mul,
+    '/': operator.truediv,
+    '%': operator.mod,
+}
+
+compiled_grammar = None
+
+def get_compiled_grammar():
+    """Gramática compilada del proyecto, cargada una sola vez (desde la caché en disco)."""
+    global compiled_grammar
+    if compiled_grammar is None:
+        compiled_grammar = backend.load_grammar_tables(write_json=False).compiled
+    return compiled_grammar
+
+def parse_expression(text):
+    """Analiza `text` y devuelve su AST; lanza LexerError o ParseError si no es válido."""
+    parser = backend.LL1Parser(get_compiled_grammar(), backend.Lexer(text), backend.START_SYMBOL)
+    return parser.parse_ast()
+
+def variables(node):
+    """Nombres de variable usados en el AST."""
+    names = set()
+    pending = [node]
+    while pending:
+        node = pending.pop()
+        if isinstance(node, backend.BinaryNode):
+            pending.append(node.left)
+            pending.append(node.right)
+        elif isinstance(node, backend.VariableNode):
+            names.add(node.name)
+    return names
+
+def evaluate(node, env, operators=OPERATORS):
+    """Evalúa el AST con las variables de `env`.
+
+    Recorrido en postorden con pila explícita: una cadena larga de operadores
+    genera un árbol muy profundo que no cabe en la recursión de Python.
+    """
+    values = []
+    pending = [(node, False)]
+    while pending:
+        node, ready = pending.pop()
+        if isinstance(node, backend.BinaryNode):
+            if ready:
+                right = values.pop()
+                values[-1] = operators[node.op](values[-1], right)
+            else:
+                pending.append((node, True))
+                pending.append((node.right, False))
+                pending.append((node.left, False))
+        elif isinstance(node, backend.NumberNode):
+            values.append(node.value)
+        else:
+            try:
+                values.append(env[node.name])
+            except KeyError:
+                raise NameError(f"Variable sin valor: '{node.name}'") from None
+    return values[0]
+
+def evaluate_columns(node, columns):
+    """Evalúa el AST sobre columnas completas (arrays de NumPy) sin recorrer fila por fila.
+
+    `columns` asocia cada variable a una secuencia de igual largo; el resultado es un
+    array float64 de ese largo. A diferencia de evaluate(), la división por cero da
+    inf/nan (semántica de NumPy) en lugar de lanzar ZeroDivisionError. El módulo %
+    sigue la convención de Python (signo del divisor).
+    """
+    if np is None:
+        raise ImportError("evaluate_columns() requiere NumPy (pip install numpy)")
+    arrays = {name: np.asarray(columns[name], dtype=np.float64) for name in variables(node) if name in columns}
+    missing = variables(node) - arrays.keys()
+    if missing:
+        raise NameError(f"Variable sin valor: '{sorted(missing)[0]}'")
+    lengths = {len(column) for column in arrays.values()}
+    if len(lengths) > 1:
+        raise ValueError("Todas las columnas deben tener el mismo largo")
+    ufuncs = {'+': np.add, '-': np.subtract, '*': np.multiply, '/': np.divide, '%': np.mod}
+
+    # Cada valor es (resultado, es_temporal). Los temporales son arrays propios que se
+    # reutilizan como salida (out=) para no reservar memoria nueva en cada operación.
+    values = []
+    pending = [(node, False)]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        while pending:
+            node, ready = pending.pop()
+            if isinstance(node, backend.BinaryNode):
+                if ready:
+                    right, right_temporary = values.pop()
+                    left, left_temporary = values[-1]
+                    ufunc = ufuncs[node.op]
+                    if left_temporary:
+                        values[-1] = (ufunc(left, right, out=left), True)
+                    elif right_temporary:
+                        values[-1] = (ufunc(left, right, out=right), True)
+                    else:
+                        result = ufunc(left, right)
+                        values[-1] = (result, isinstance(result, np.ndarray))
+                else:
+                    pending.append((node, True))
+                    pending.append((node.right, False))
+                    pending.append((node.left, False))
+            elif isinstance(node, backend.NumberNode):
+                values.append((node.value, False))
+            else:
+                values.append((arrays[node.name], False))
+    result, temporary = values[0]
+    if temporary:
+        return result
+    # Una expresión constante (o una sola variable) se entrega igual como array propio
+    rows = lengths.pop() if lengths else 1
+    return np.array(np.broadcast_to(result, (rows,)), dtype=np.float64)
+
+# -------------------------------------------------
+# Expresiones compiladas y caché LRU
+# -------------------------------------------------
+
+# Profundidad máxima de operadores para generar código Python: el compilador de
+# Python limita el anidamiento de paréntesis (200) y recurre por cada nivel
+COMPILE_DEPTH_LIMIT = 100
+
+class CompiledExpression:
+    """Expresión analizada una sola vez y convertida en una función env -> valor."""
+    __slots__ = ('source', 'ast', 'variables', 'function', 'generated')
+
+    def __init__(self, source, ast, function, generated):
+        self.source = source
+        self.ast = ast
+        self.variables = frozenset(variables(ast))
+        self.function = function
+        self.generated = generated
+
+    def __call__(self, env):
+        return self.function(env)
+
+    def __repr__(self):
+        return f"CompiledExpression({self.source!r})"
+
+def ast_depth(node):
+    """Altura del AST en operadores binarios (recorrido iterativo)."""
+    depth = 0
+    pending = [(node, 0)]
+    while pending:
+        node, level = pending.pop()
+        if isinstance(node, backend.BinaryNode):
+            level += 1
+            depth = max(depth, level)
+            pending.append((node.left, level))
+            pending.append((node.right, level))
+    return depth
+
+def generate_function_source(node):
+    """Código de `def expression(env)` equivalente a evaluate(node, env).
+
+    Las variables se leen una vez al inicio; una variable ausente lanza NameError
+    igual que evaluate().
+    """
+    local_names = {name: f"x{i}" for i, name in enumerate(sorted(variables(node)))}
+    parts = []
+    pending = [node]
+    while pending:
+        node = pending.pop()
+        if isinstance(node, str):
+            parts.append(node)
+        elif isinstance(node, backend.BinaryNode):
+            pending.extend((')', node.right, f" {node.op} ", node.left, '('))
+        elif isinstance(node, backend.NumberNode):
+            parts.append(repr(node.value) if math.isfinite(node.value) else 'INF')
+        else:
+            parts.append(local_names[node.name])
+    lines = ["def expression(env):"]
+    if local_names:
+        lines.append("    try:")
+        lines.extend(f"        {local} = env[{name!r}]" for name, local in local_names.items())
+        lines.append("    except KeyError as error:")
+        lines.append("        raise NameError(f\"Variable sin valor: '{error.args[0]}'\") from None")
+    lines.append(f"    return {''.join(parts)}")
+    return "\n".join(lines) + "\n"
+
+def compile_ast(source, ast):
+    """Convierte el AST en una CompiledExpression.
+
+    Genera y compila código Python; si el árbol es demasiado profundo para el
+    compilador de Python, usa una clausura sobre evaluate() (más lenta, sin límite).
+    """
+    if ast_depth(ast) <= COMPILE_DEPTH_LIMIT:
+        namespace = {'INF': math.inf}
+        try:
+            exec(compile(generate_function_source(ast), '<expresión>', 'exec'), namespace)
+            return CompiledExpression(source, ast, namespace['expression'], True)
+        except (SyntaxError, RecursionError, MemoryError):
+            pass
+    return CompiledExpression(source, ast, lambda env: evaluate(ast, env), False)
+
+class ExpressionCache:
+    """Caché LRU de expresiones compiladas indexada por el texto fuente.
+
+    Los errores de análisis no se guardan: se relanzan en cada llamada.
+    """
+    def __init__(self, maxsize=1024):
+        if maxsize < 1:
+            raise ValueError("maxsize debe ser al menos 1")
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, text):
+        with self.lock:
+            compiled = self.entries.get(text)
+            if compiled is not None:
+                self.entries.move_to_end(text)
+                self.hits += 1
+                return compiled
+            self.misses += 1
+        # Se compila fuera del candado; si dos hilos compilan lo mismo, gana el último
+        compiled = compile_ast(text, parse_expression(text))
+        with self.lock:
+            self.entries[text] = compiled
+            self.entries.move_to_end(text)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+        return compiled
+
+    def stats(self):
+        """Contadores de la caché como diccionario."""
+        with self.lock:
+            return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+                    'size': len(self.entries), 'maxsize': self.maxsize}
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, text):
+        return text in self.entries
+
+expression_cache = ExpressionCache()
+
+def compile_expression(text, cache=expression_cache):
+    """Analiza `text` una vez y devuelve una CompiledExpression reutilizable.
+
+    Con `cache` (por defecto la caché global del módulo) las llamadas repetidas con el
+    mismo texto devuelven el mismo objeto; cache=None compila siempre.
+    """
+    if cache is None:
+        return compile_ast(text, parse_expression(text))
+    return cache.get(text)
@@ -0,0 +1,250 @@
+import argparse
+import re
+
+import proyecto_final as backend
+
+# -------------------------------------------------
+# Generador de parsers LL(1) en Python
+# Convierte una gramática compilada en un módulo independiente con un
+# parser descendente recursivo: una función por no-terminal que decide
+# la producción comparando el tipo del token, sin consultar tablas.
+# -------------------------------------------------
+
+# Niveles de anidamiento (vueltas por un ciclo como E -> T -> F -> E) que el parser
+# generado analiza con llamadas recursivas; más adentro sigue con una pila explícita,
+# así una entrada muy anidada no agota el límite de recursión de Python
+MAX_DEPTH = 100
+
+MODULE_HEADER = '''"""Parser LL(1) generado por generador_parser.py a partir de la gramática {fingerprint}.
+
+No editar: se regenera desde la gramática. El módulo no depende del generador;
+solo necesita una fuente de tokens con get_next_token() cuyos tokens tengan .type y .pos.
+"""
+
+START_SYMBOL = {start!r}
+MAX_DEPTH = {max_depth!r}
+
+class ParseError(Exception):
+    """Error de sintaxis con el símbolo esperado y el token (tipo y posición) encontrado."""
+    def __init__(self, message, expected=None, token=None):
+        super().__init__(message)
+        self.expected = expected
+        self.token = token
+        self.found = token.type if token is not None else None
+        self.pos = token.pos if token is not None else None
+
+'''
+
+PARSER_HEADER = '''class Parser:
+    def __init__(self, lexer):
+        self.lexer = lexer
+        self.next_token = lexer.get_next_token
+        self.token = self.next_token()
+        self.kind = self.token.type
+        self.depth = 0
+
+    def mismatch(self, expected):
+        return ParseError(f"Error de sintaxis: Se esperaba '{{expected}}' pero se encontró '{{self.kind}}'", expected, self.token)
+
+    def no_rule(self, non_terminal):
+        return ParseError(f"Error de sintaxis: No hay regla para [{{non_terminal}}, {{self.kind}}]", non_terminal, self.token)
+
+    def parse(self):
+        """Analiza la entrada completa; devuelve True o lanza ParseError."""
+        self.{start_function}()
+        if self.kind != {eof!r}:
+            raise self.mismatch({eof!r})
+        return True
+
+    def parse_stack(self, non_terminal):
+        """Analiza `non_terminal` con la tabla y una pila explícita (sin recursión)."""
+        stack = [non_terminal]
+        pop, extend = stack.pop, stack.extend
+        while stack:
+            top = pop()
+            if top in NON_TERMINALS:
+                production = TABLE.get((top, self.kind))
+                if production is None:
+                    raise self.no_rule(top)
+                extend(production)
+            elif top == self.kind:
+                self.token = token = self.next_token()
+                self.kind = token.type
+            else:
+                raise self.mismatch(top)
+'''
+
+def function_names(non_terminals):
+    """Nombre de función válido y único para cada no-terminal (E' -> parse_E_prime)."""
+    names = {}
+    used = set()
+    for nt in non_terminals:
+        base = 'parse_' + re.sub(r'\W', '_', nt.replace("'", '_prime'))
+        name = base
+        suffix = 2
+        while name in used:
+            name = f"{base}_{suffix}"
+            suffix += 1
+        used.add(name)
+        names[nt] = name
+    return names
+
+def kind_test(terminals, constants):
+    """Condición que compara self.kind (ya en la variable local `kind`) con los terminales."""
+    if len(terminals) == 1:
+        return f"kind == {terminals[0]!r}"
+    if len(terminals) <= 3:
+        return " or ".join(f"kind == {t!r}" for t in terminals)
+    name = f"_KINDS_{len(constants)}"
+    constants.append(f"{name} = frozenset({sorted(terminals)!r})")
+    return f"kind in {name}"
+
+def tail_loops(nt, alternatives):
+    """True si alguna producción termina en el mismo no-terminal (se genera un ciclo)."""
+    return any(production and production[-1] == nt for _, production in alternatives)
+
+def call_graph(all_alternatives, terminals):
+    """No-terminales a los que llama la función de cada no-terminal (sin los ciclos de cola)."""
+    graph = {}
+    for nt, alternatives in all_alternatives.items():
+        loops = tail_loops(nt, alternatives)
+        calls = []
+        for _, production in alternatives:
+            for position, symbol in enumerate(production):
+                if symbol in terminals or (loops and symbol == nt and position == len(production) - 1):
+                    continue
+                if symbol not in calls:
+                    calls.append(symbol)
+        graph[nt] = calls
+    return graph
+
+def back_edges(graph, start):
+    """Llamadas (origen, destino) que cierran un ciclo en un recorrido en profundidad.
+
+    Todo ciclo de llamadas pasa por una de ellas: si solo esas llamadas cuentan la
+    profundidad, la recursión queda acotada por MAX_DEPTH veces el largo del ciclo.
+    """
+    edges = set()
+    state = {}     # 1: en el camino actual; 2: terminado
+    roots = [start] + [nt for nt in graph if nt != start]
+    for root in roots:
+        if root in state:
+            continue
+        state[root] = 1
+        path = [(root, iter(graph[root]))]
+        while path:
+            nt, callees = path[-1]
+            callee = next(callees, None)
+            if callee is None:
+                state[nt] = 2
+                path.pop()
+            elif state.get(callee) == 1:
+                edges.add((nt, callee))
+            elif callee not in state:
+                state[callee] = 1
+                path.append((callee, iter(graph[callee])))
+    return edges
+
+def generate_function(nt, alternatives, names, terminals, constants, deep_calls=()):
+    """Código de la función de un no-terminal.
+
+    `alternatives` es una lista de (terminales que la eligen, producción). Si una
+    producción termina en el mismo no-terminal, se genera un ciclo en lugar de la
+    llamada recursiva (E' -> + T E'), para no acumular marcos por cada operador.
+    Las llamadas a los no-terminales de `deep_calls` cuentan la profundidad y, pasado
+    MAX_DEPTH, siguen con parse_stack().
+    """
+    loops = tail_loops(nt, alternatives)
+    indent = ' ' * (12 if loops else 8)
+    lines = [f"    def {names[nt]}(self):"]
+    if loops:
+        lines.append("        while True:")
+    lines.append(f"{indent}kind = self.kind")
+    for dispatch, production in alternatives:
+        lines.append(f"{indent}if {kind_test(dispatch, constants)}:")
+        body = []
+        for position, symbol in enumerate(production):
+            last = position == len(production) - 1
+            if symbol in terminals:
+                # El primer terminal ya fue verificado por el despacho
+                if position > 0:
+                    body.append(f"if self.kind != {symbol!r}:")
+                    body.append(f"    raise self.mismatch({symbol!r})")
+                body.append("self.token = token = self.next_token()")
+                body.append("self.kind = token.type")
+            elif loops and last and symbol == nt:
+                body.append("continue")
+            elif symbol in deep_calls:
+                body.append("if self.depth < MAX_DEPTH:")
+                body.append("    self.depth += 1")
+                body.append(f"    self.{names[symbol]}()")
+                body.append("    self.depth -= 1")
+                body.append("else:")
+                body.append(f"    self.parse_stack({symbol!r})")
+            else:
+                body.append(f"self.{names[symbol]}()")
+        if not body or body[-1] != "continue":
+            body.append("return")
+        lines.extend(f"{indent}    {line}" for line in body)
+    lines.append(f"{indent}raise self.no_rule({nt!r})")
+    return lines
+
+def generate_parser_source(compiled, fingerprint=''):
+    """Código fuente de un módulo parser equivalente a LL1Parser con esta gramática compilada."""
+    terminals = set(compiled.symbols[:compiled.n_terminals])
+    non_terminals = compiled.symbols[compiled.n_terminals:]
+    names = function_names(non_terminals)
+    all_alternatives = {}
+    table = {}
+    for nt in non_terminals:
+        row = compiled.symbol_id[nt] - compiled.n_terminals
+        # Terminales que eligen cada producción de la fila, en el orden de la gramática
+        by_production = {}
+        for terminal in range(compiled.n_terminals):
+            production = compiled.table[row * compiled.stride + terminal]
+            if production >= 0:
+                by_production.setdefault(production, []).append(compiled.symbols[terminal])
+        alternatives = [(dispatch, [s for s in compiled.productions[p][1] if s != backend.TOKEN_EPSILON])
+                        for p, dispatch in sorted(by_production.items())]
+        all_alternatives[nt] = alternatives
+        for dispatch, production in alternatives:
+            for terminal in dispatch:
+                table[(nt, terminal)] = tuple(reversed(production))
+
+    start = compiled.symbols[compiled.start]
+    deep = back_edges(call_graph(all_alternatives, terminals), start)
+    constants = []
+    functions = []
+    for nt in non_terminals:
+        functions.append("")
+        deep_calls = {callee for caller, callee in deep if caller == nt}
+        functions.extend(generate_function(nt, all_alternatives[nt], names, terminals, constants, deep_calls))
+
+    source = MODULE_HEADER.format(fingerprint=fingerprint or 'compilada', start=start, max_depth=MAX_DEPTH)
+    # Tabla para parse_stack(): (no-terminal, terminal) -> producción invertida
+    source += f"NON_TERMINALS = frozenset({sorted(non_terminals)!r})\n"
+    source += "TABLE = {\n" + "".join(f"    {key!r}: {value!r},\n" for key, value in table.items()) + "}\n\n"
+    if constants:
+        source += "\n".join(constants) + "\n\n"
+    source += PARSER_HEADER.format(start_function=names[start], eof=backend.TOKEN_EOF)
+    source += "\n".join(functions) + "\n"
+    return source
+
+def write_parser_module(compiled, filename, fingerprint=''):
+    source = generate_parser_source(compiled, fingerprint)
+    with open(filename, 'w', encoding='utf-8') as f:
+        f.write(source)
+    return filename
+
+# --- EJECUCIÓN PRINCIPAL ---
+if __name__ == '__main__':
+    arg_parser = argparse.ArgumentParser(description="Genera un parser descendente recursivo a partir de la tabla LL(1)")
+    arg_parser.add_argument('salida', help="Archivo .py a generar")
+    arg_parser.add_argument('--gramatica', help="Gramática externa (.json o BNF); por defecto la del proyecto")
+    args = arg_parser.parse_args()
+
+    grammar = backend.Grammar.from_file(args.gramatica) if args.gramatica else backend.Grammar(backend.GRAMMAR, backend.START_SYMBOL)
+    tables = grammar.tables()
+    fingerprint = backend.grammar_fingerprint(grammar.productions, grammar.start_symbol)
+    write_parser_module(tables.compiled, args.salida, fingerprint[:12])
+    print(f"Parser generado: {args.salida}")
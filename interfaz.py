@@ -1,11 +1,229 @@
 import tkinter as tk
-from tkinter import filedialog, messagebox, scrolledtext
+from tkinter import filedialog, messagebox, scrolledtext, ttk
 import json
 import os
+import queue
+import threading
+from array import array
 
 # Importamos la lógica de tu proyecto (asegúrate que tu otro archivo se llame 'proyecto_final.py')
 # Si tu archivo tiene otro nombre, cambia 'proyecto_final' por ese nombre.
 import proyecto_final as backend
+import verificador
+
+# --- ANÁLISIS EN SEGUNDO PLANO ---
+POLL_MS = 50                # Cada cuánto la ventana recoge el avance del análisis
+LIVE_TRACE_LINES = 2000     # Líneas de traza que se muestran en la consola; el resto, en el visor
+TRACE_PAGE_SIZE = 1000      # Líneas por página del visor de traza
+CHECK_DELAY_MS = 300        # Pausa de escritura antes de la verificación en vivo
+MAX_UNDERLINED = 50         # Errores subrayados como máximo en el editor
+LEX_CHUNK_CHARS = 1 << 16   # Caracteres por tramo al tokenizar (entre tramos se revisa Cancelar)
+CHECK_EVERY_STEPS = 1024    # Pasos del parser entre revisiones de Cancelar y del avance
+
+class AnalysisCancelled(Exception):
+    pass
+
+class TraceLog:
+    """Traza de un análisis guardada como puntos de control, no como texto.
+
+    Con los tokens y la tabla, el análisis LL(1) es determinista: cada TRACE_PAGE_SIZE
+    pasos se guarda (índice de token, pila) y las líneas pedidas se formatean
+    reanalizando desde el punto de control anterior. Se indexa por tramos como una
+    lista de líneas (encabezado incluido), así que el visor solo formatea su página.
+    """
+    def __init__(self, compiled_grammar, tokens):
+        self.grammar = compiled_grammar
+        self.tokens = tokens
+        self.header = backend.format_trace_header()
+        self.checkpoints = []
+        self.steps = 0
+
+    def __len__(self):
+        return len(self.header) + self.steps
+
+    def __getitem__(self, index):
+        start, stop, _ = index.indices(len(self))
+        lines = self.header[start:stop]
+        first = max(start - len(self.header), 0)
+        last = stop - len(self.header)
+        if last > first:
+            lines += self.format_steps(first, last)
+        return lines
+
+    def format_steps(self, first, last):
+        grammar = self.grammar
+        symbols = grammar.symbols
+        # Vista propia de los tokens: el cursor del buffer lo usa el análisis en curso
+        tokens = backend.TokenBuffer(self.tokens.text, self.tokens.kinds, self.tokens.starts, self.tokens.ends)
+        step = first // TRACE_PAGE_SIZE * TRACE_PAGE_SIZE
+        index, stack = self.checkpoints[first // TRACE_PAGE_SIZE]
+        parser = backend.LL1Parser(grammar, tokens, backend.START_SYMBOL)
+        parser.stack = stack = list(stack)
+        lines = []
+        for index, production in parser.parse_steps(index):
+            if step >= first:
+                token = tokens[index]
+                if production is None:
+                    action = (backend.ACTION_MATCH, token.type)
+                else:
+                    action = (backend.ACTION_RULE, *grammar.productions[production])
+                lines.append(backend.format_trace_event(list(map(symbols.__getitem__, stack)), token, action))
+            step += 1
+            # No se pide el paso siguiente: podría ser el error con que terminó el análisis
+            if step >= last:
+                break
+        return lines
+
+class AnalysisJob:
+    """Análisis que corre en un hilo aparte sin tocar la interfaz.
+
+    La traza queda en `trace` (un TraceLog, una vez tokenizada la entrada), el avance
+    en `progress` (0 a 1: la primera mitad es el lexer) y el resultado final llega por
+    `results` como (ok, mensaje). La ventana lo consulta periódicamente con after();
+    el hilo nunca llama a Tk.
+    """
+    def __init__(self, code, compiled_grammar):
+        self.code = code
+        self.size = max(len(code), 1)
+        self.compiled_grammar = compiled_grammar
+        self.trace = None
+        self.progress = 0.0
+        self.cancel_event = threading.Event()
+        self.results = queue.Queue()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+
+    def start(self):
+        self.thread.start()
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def tokenize(self):
+        """TokenBuffer de todo el código, tokenizado por tramos que terminan en un salto de línea."""
+        code = self.code
+        lexer = backend.Lexer(code)
+        end = lexer.end
+        offset_code = 'I' if end < 2 ** 32 else 'Q'
+        kinds, starts, ends = array('B'), array(offset_code), array(offset_code)
+        while True:
+            if self.cancel_event.is_set():
+                raise AnalysisCancelled()
+            # Un token nunca contiene un salto de línea, así que se puede cortar justo después de uno
+            cut = code.find('\n', lexer.pos + LEX_CHUNK_CHARS, end)
+            lexer.end = end if cut < 0 else cut + 1
+            piece = lexer.tokenize_buffer()
+            # El EOF de cada tramo se descarta, salvo el del último
+            count = len(piece.kinds) if lexer.end == end else len(piece.kinds) - 1
+            kinds.extend(piece.kinds[:count])
+            starts.extend(piece.starts[:count])
+            ends.extend(piece.ends[:count])
+            self.progress = 0.5 * lexer.end / self.size
+            if lexer.end == end:
+                return backend.TokenBuffer(code, kinds, starts, ends)
+
+    def run(self):
+        try:
+            tokens = self.tokenize()
+            trace = TraceLog(self.compiled_grammar, tokens)
+            self.trace = trace
+            parser = backend.LL1Parser(self.compiled_grammar, tokens, backend.START_SYMBOL)
+            stack = parser.stack
+            starts = tokens.starts
+            for index, _ in parser.parse_steps():
+                steps = trace.steps
+                if steps % TRACE_PAGE_SIZE == 0:
+                    trace.checkpoints.append((index, tuple(stack)))
+                if steps % CHECK_EVERY_STEPS == 0:
+                    if self.cancel_event.is_set():
+                        raise AnalysisCancelled()
+                    self.progress = 0.5 + 0.5 * starts[index] / self.size
+                # Se cuenta después de guardar el punto de control: la ventana lee en paralelo
+                trace.steps = steps + 1
+            self.progress = 1.0
+            self.results.put((True, None))
+        except AnalysisCancelled:
+            self.results.put((False, None))
+        except Exception as e:
+            self.results.put((False, str(e)))
+
+class LiveChecker:
+    """Verificación en vivo en un hilo aparte, con su propio IncrementalChecker.
+
+    submit() deja pendiente el texto más reciente (descarta uno anterior que aún no
+    se revisó); el hilo aplica update() y publica (versión, errores) en `results`.
+    Así el primer análisis de un archivo grande, o un cambio de paréntesis que obliga
+    a reanalizar hasta el final, no congela la ventana.
+    """
+    def __init__(self, compiled_grammar):
+        self.checker = verificador.IncrementalChecker(compiled_grammar)
+        self.results = queue.Queue()
+        self.pending = None
+        self.condition = threading.Condition()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def submit(self, version, text):
+        with self.condition:
+            self.pending = (version, text)
+            self.condition.notify()
+
+    def run(self):
+        while True:
+            with self.condition:
+                while self.pending is None:
+                    self.condition.wait()
+                version, text = self.pending
+                self.pending = None
+            try:
+                self.checker.update(text)
+                errors = self.checker.errors(MAX_UNDERLINED)
+            except Exception as e:
+                # Un fallo no debe matar el hilo: se informa y el próximo texto se revisa desde cero
+                errors = [RuntimeError(f"Error del verificador: {type(e).__name__}: {e}")]
+                self.checker = verificador.IncrementalChecker(self.checker.grammar)
+            self.results.put((version, errors))
+
+class TraceViewer:
+    """Ventana que muestra una lista de líneas por páginas, sin cargarla entera en un Text."""
+    def __init__(self, root, lines, title="Traza del parser"):
+        self.lines = lines
+        self.page = 0
+        self.top = tk.Toplevel(root)
+        self.top.title(title)
+        self.top.geometry("800x500")
+
+        frame_nav = tk.Frame(self.top, pady=5)
+        frame_nav.pack(fill="x")
+        tk.Button(frame_nav, text="⏮", command=lambda: self.show_page(0)).pack(side="left", padx=2)
+        tk.Button(frame_nav, text="◀ Anterior", command=lambda: self.show_page(self.page - 1)).pack(side="left", padx=2)
+        tk.Button(frame_nav, text="Siguiente ▶", command=lambda: self.show_page(self.page + 1)).pack(side="left", padx=2)
+        tk.Button(frame_nav, text="⏭", command=lambda: self.show_page(self.pages() - 1)).pack(side="left", padx=2)
+        self.lbl_page = tk.Label(frame_nav)
+        self.lbl_page.pack(side="left", padx=10)
+        tk.Label(frame_nav, text="Ir a página:").pack(side="left")
+        self.entry_page = tk.Entry(frame_nav, width=8)
+        self.entry_page.pack(side="left")
+        self.entry_page.bind("<Return>", self.go_to_page)
+
+        self.text = scrolledtext.ScrolledText(self.top, font=("Consolas", 9))
+        self.text.pack(fill="both", expand=True)
+        self.show_page(0)
+
+    def pages(self):
+        return max(1, -(-len(self.lines) // TRACE_PAGE_SIZE))
+
+    def show_page(self, page):
+        self.page = min(max(page, 0), self.pages() - 1)
+        start = self.page * TRACE_PAGE_SIZE
+        self.text.delete(1.0, tk.END)
+        self.text.insert(tk.END, "\n".join(self.lines[start:start + TRACE_PAGE_SIZE]))
+        self.lbl_page.config(text=f"Página {self.page + 1} de {self.pages()} ({len(self.lines):,} líneas)")
+
+    def go_to_page(self, event=None):
+        try:
+            self.show_page(int(self.entry_page.get()) - 1)
+        except ValueError:
+            pass
 
 class CompiladorApp:
     def __init__(self, root):
@@ -16,6 +234,14 @@ class CompiladorApp:
         # --- Variables ---
         self.file_path = None
         self.ll1_table = None
+        self.compiled_grammar = None
+        self.job = None
+        self.trace_lines = []
+        self.shown_lines = 0
+        self.checker = None
+        self.check_after = None
+        self.check_version = 0      # Versión del texto enviada al verificador
+        self.check_polling = False
 
         # --- UI Layout ---
         
@@ -29,8 +255,14 @@ class CompiladorApp:
         self.lbl_file = tk.Label(frame_top, text="Ningún archivo cargado", fg="gray")
         self.lbl_file.pack(side="left")
 
-        btn_run = tk.Button(frame_top, text="▶ Ejecutar Análisis", command=self.run_analysis, bg="#4CAF50", fg="white", font=("Arial", 10, "bold"))
-        btn_run.pack(side="right", padx=20)
+        self.btn_run = tk.Button(frame_top, text="▶ Ejecutar Análisis", command=self.run_analysis, bg="#4CAF50", fg="white", font=("Arial", 10, "bold"))
+        self.btn_run.pack(side="right", padx=20)
+
+        self.btn_cancel = tk.Button(frame_top, text="■ Cancelar", command=self.cancel_analysis, state="disabled", font=("Arial", 10))
+        self.btn_cancel.pack(side="right")
+
+        self.progress = ttk.Progressbar(frame_top, length=150, maximum=1.0)
+        self.progress.pack(side="right", padx=10)
 
         # 2. Sección Central: Código Fuente y Consola
         paned_window = tk.PanedWindow(self.root, orient="vertical")
@@ -41,6 +273,12 @@ class CompiladorApp:
         paned_window.add(frame_code)
         self.txt_code = scrolledtext.ScrolledText(frame_code, height=10, font=("Consolas", 10))
         self.txt_code.pack(fill="both", expand=True)
+        self.txt_code.tag_configure("error", underline=True, foreground="red")
+        self.txt_code.bind("<<Modified>>", self.on_code_modified)
+
+        # Resultado de la verificación en vivo
+        self.lbl_status = tk.Label(frame_code, anchor="w", fg="gray")
+        self.lbl_status.pack(fill="x")
 
         # Área de Resultados (Salida del Parser)
         frame_output = tk.LabelFrame(paned_window, text="Salida del Analizador", padx=5, pady=5)
@@ -56,25 +294,24 @@ class CompiladorApp:
         tk.Button(frame_bottom, text="Ver First", command=lambda: self.show_json("resultado_conjunto_first.json")).pack(side="left", padx=10)
         tk.Button(frame_bottom, text="Ver Follow", command=lambda: self.show_json("resultado_conjunto_follow.json")).pack(side="left", padx=10)
         tk.Button(frame_bottom, text="Ver Tabla LL(1)", command=lambda: self.show_json("resultado_tabla_sintactica.json")).pack(side="left", padx=10)
+        tk.Button(frame_bottom, text="Ver Traza Completa", command=self.show_trace).pack(side="left", padx=10)
 
         # Inicializar backend (Generar tablas al arrancar)
         self.init_backend()
 
     def init_backend(self):
-        """Ejecuta los algoritmos generadores al inicio."""
+        """Carga las tablas del compilador (desde la caché en disco si están vigentes)."""
         self.log("Inicializando algoritmos del compilador...")
         try:
-            # Generar y guardar todo usando las funciones de tu backend
-            backend.write_to_file(backend.GRAMMAR, "resultado_gramatica.json")
-            
-            self.first_sets = backend.calculate_first_sets(backend.GRAMMAR, backend.NON_TERMINALS)
-            backend.write_to_file(self.first_sets, "resultado_conjunto_first.json")
-            
-            self.follow_sets = backend.calculate_follow_sets(backend.GRAMMAR, backend.START_SYMBOL, self.first_sets)
-            backend.write_to_file(self.follow_sets, "resultado_conjunto_follow.json")
-            
-            self.ll1_table = backend.build_ll1_table(backend.GRAMMAR, self.first_sets, self.follow_sets)
-            backend.write_to_file(self.ll1_table, "resultado_tabla_sintactica.json")
+            # Los JSON de los visores solo se regeneran si no corresponden a la gramática actual
+            tables = backend.load_grammar_tables(log=self.log)
+            self.first_sets = tables.first_sets
+            self.follow_sets = tables.follow_sets
+            self.ll1_table = tables.table
+            # Versión con símbolos enteros que usa el parser; el JSON legible queda para los visores
+            self.compiled_grammar = tables.compiled
+            # Verificador incremental (en su propio hilo) para revisar el código mientras se escribe
+            self.checker = LiveChecker(self.compiled_grammar)
             
             self.log("✅ Tablas generadas correctamente (First, Follow, LL1). Listo para analizar.")
         except Exception as e:
@@ -97,51 +334,127 @@ class CompiladorApp:
         if not code:
             messagebox.showwarning("Aviso", "El área de código está vacía.")
             return
+        if self.job is not None:
+            return
 
         self.log("\n--- INICIANDO ANÁLISIS ---")
+        # El análisis corre en otro hilo; poll_analysis() recoge la traza por lotes
+        self.job = AnalysisJob(code, self.compiled_grammar)
+        self.trace_lines = []
+        self.shown_lines = 0
+        self.btn_run.config(state="disabled")
+        self.btn_cancel.config(state="normal")
+        self.progress["value"] = 0
+        self.job.start()
+        self.root.after(POLL_MS, self.poll_analysis)
+
+    def cancel_analysis(self):
+        if self.job is not None:
+            self.job.cancel()
+
+    def poll_analysis(self):
+        job = self.job
+        if job.trace is not None:
+            self.trace_lines = job.trace
+        self.flush_trace()
+        self.progress["value"] = job.progress
         try:
-            # Redirigir prints es complicado en GUI simple, así que simulamos la ejecución
-            lexer = backend.Lexer(code)
-            parser = backend.LL1Parser(self.ll1_table, lexer, backend.START_SYMBOL)
-            
-            # Ejecutamos paso a paso para mostrarlo en la GUI (modificación ligera del loop)
-            self.log(f"{'PILA':<40} | {'TOKEN':<15} | ACCIÓN")
-            self.log("-" * 70)
-            
-            # Nota: Aquí estamos replicando el loop del parser para poder imprimir en la GUI
-            # Lo ideal sería que tu clase Parser tuviera un callback, pero esto sirve para el demo.
-            while parser.stack:
-                top = parser.stack[-1]
-                token = parser.current_token.type
-                stack_str = str(parser.stack)
-                
-                if top in backend.TERMINALS or top == backend.TOKEN_EOF:
-                    if top == token:
-                        self.log(f"{stack_str:<40} | {token:<15} | Match: {token}")
-                        parser.stack.pop()
-                        parser.current_token = parser.lexer.get_next_token()
-                    else:
-                        raise Exception(f"Se esperaba '{top}' pero llegó '{token}'")
-                elif top in backend.NON_TERMINALS:
-                    if token in self.ll1_table[top]:
-                        prod = self.ll1_table[top][token]
-                        self.log(f"{stack_str:<40} | {token:<15} | Regla: {top} -> {' '.join(prod)}")
-                        parser.stack.pop()
-                        if prod != [backend.TOKEN_EPSILON]:
-                            for s in reversed(prod):
-                                parser.stack.append(s)
-                    else:
-                        raise Exception(f"No hay regla para [{top}, {token}]")
-                else:
-                    raise Exception(f"Símbolo desconocido: {top}")
-            
+            ok, error = job.results.get_nowait()
+        except queue.Empty:
+            self.root.after(POLL_MS, self.poll_analysis)
+            return
+
+        if job.trace is not None:
+            self.trace_lines = job.trace
+        self.flush_trace()
+        self.job = None
+        self.btn_run.config(state="normal")
+        self.btn_cancel.config(state="disabled")
+        if ok:
             self.log("-" * 70)
             self.log(">>> ✅ EL CÓDIGO ES SINTÁCTICAMENTE CORRECTO <<<")
             messagebox.showinfo("Resultado", "Análisis Exitoso: El código es correcto.")
+        elif error is None:
+            self.log(">>> Análisis cancelado <<<")
+        else:
+            self.log(f"\n>>> ❌ ERROR DE SINTAXIS: {error} <<<")
+            messagebox.showerror("Error de Sintaxis", error)
 
-        except Exception as e:
-            self.log(f"\n>>> ❌ ERROR DE SINTAXIS: {e} <<<")
-            messagebox.showerror("Error de Sintaxis", str(e))
+    def flush_trace(self):
+        """Vuelca en la consola, de una sola vez, las líneas de traza nuevas (hasta LIVE_TRACE_LINES)."""
+        available = len(self.trace_lines)
+        if self.shown_lines >= available or self.shown_lines > LIVE_TRACE_LINES:
+            return
+        end = min(available, LIVE_TRACE_LINES)
+        if self.shown_lines < end:
+            self.log("\n".join(self.trace_lines[self.shown_lines:end]))
+            self.shown_lines = end
+        if available > LIVE_TRACE_LINES:
+            self.log("... traza truncada en la consola: usa 'Ver Traza Completa' para recorrerla por páginas")
+            self.shown_lines = LIVE_TRACE_LINES + 1
+
+    def show_trace(self):
+        if not self.trace_lines:
+            messagebox.showinfo("Traza", "Todavía no hay una traza para mostrar.")
+            return
+        TraceViewer(self.root, self.trace_lines)
+
+    def on_code_modified(self, event=None):
+        if not self.txt_code.edit_modified():
+            return
+        self.txt_code.edit_modified(False)
+        # Un resultado que llegue ahora ya no corresponde al texto del editor
+        self.check_version += 1
+        # Se espera a que el usuario deje de escribir antes de verificar
+        if self.check_after is not None:
+            self.root.after_cancel(self.check_after)
+        self.check_after = self.root.after(CHECK_DELAY_MS, self.live_check)
+
+    def live_check(self):
+        """Envía el código al verificador en vivo; poll_check() aplica el resultado."""
+        self.check_after = None
+        if self.checker is None:
+            return
+        self.check_version += 1
+        self.checker.submit(self.check_version, self.txt_code.get("1.0", "end-1c"))
+        if not self.check_polling:
+            self.check_polling = True
+            self.root.after(POLL_MS, self.poll_check)
+
+    def poll_check(self):
+        latest = None
+        while True:
+            try:
+                latest = self.checker.results.get_nowait()
+            except queue.Empty:
+                break
+        if latest is not None and latest[0] == self.check_version:
+            self.check_polling = False
+            self.show_check_errors(latest[1])
+        else:
+            # Falta el resultado del texto actual (los de versiones anteriores se descartan)
+            self.root.after(POLL_MS, self.poll_check)
+
+    def show_check_errors(self, errors):
+        """Subraya los errores en el editor y resume el primero en la barra de estado."""
+        self.txt_code.tag_remove("error", "1.0", tk.END)
+        for error in errors:
+            if isinstance(error, backend.ParseError) and error.found == backend.TOKEN_EOF:
+                # Falta algo al final: se marca el último caracter
+                start, end = max(error.pos - 1, 0), error.pos
+            elif isinstance(error, backend.ParseError):
+                start, end = error.pos, error.pos + len(error.token.lexeme)
+            elif isinstance(error, backend.LexerError):
+                start, end = error.pos, error.pos + 1
+            else:
+                # Fallo del propio verificador: no tiene posición, solo se informa
+                continue
+            self.txt_code.tag_add("error", f"1.0 + {start} chars", f"1.0 + {end} chars")
+        if errors:
+            more = f" (+{len(errors) - 1} más)" if len(errors) > 1 else ""
+            self.lbl_status.config(text=f"✖ {errors[0]}{more}", fg="red")
+        else:
+            self.lbl_status.config(text="✔ Sin errores de sintaxis", fg="green")
 
     def log(self, message):
         self.txt_output.insert(tk.END, message + "\n")
@@ -0,0 +1,305 @@
+import argparse
+import glob
+import itertools
+import json
+import os
+import re
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import proyecto_final as backend
+
+# -------------------------------------------------
+# Análisis por lotes
+# Valida muchas expresiones (archivos de un directorio, un patrón glob o
+# un JSONL) repartiendo el trabajo entre procesos. Cada proceso carga la
+# gramática compilada una sola vez y recibe las expresiones en bloques.
+# -------------------------------------------------
+
+CHUNK_SIZE = 64
+# Caracteres por tarea en el modo de sentencias (un archivo con muchas expresiones)
+CHUNK_CHARS = 1 << 18
+# Bloques pendientes por proceso: acota la memoria sin dejar procesos ociosos
+PENDING_PER_WORKER = 4
+
+worker_grammar = None
+
+def init_worker(cache_dir=backend.CACHE_DIR):
+    """Inicializador de cada proceso: carga la gramática compilada (desde la caché)."""
+    global worker_grammar
+    worker_grammar = backend.load_grammar_tables(cache_dir=cache_dir, write_json=False).compiled
+
+def read_items(source):
+    """Genera pares (id, texto) desde un directorio, un patrón glob o un archivo JSONL.
+
+    El texto es None para los archivos: lo lee el proceso que los analiza, así
+    por IPC solo viaja la ruta. Cada línea del JSONL es una cadena o un objeto
+    con "text" (o "expresion") y un "id" opcional; por defecto el id es el número de línea.
+    """
+    if os.path.isdir(source):
+        paths = sorted(entry.path for entry in os.scandir(source) if entry.is_file())
+    elif source.endswith('.jsonl') and os.path.isfile(source):
+        yield from read_jsonl(source)
+        return
+    elif os.path.isfile(source):
+        paths = [source]
+    else:
+        paths = sorted(path for path in glob.glob(source, recursive=True) if os.path.isfile(path))
+        if not paths:
+            raise FileNotFoundError(f"No hay archivos que coincidan con '{source}'")
+    for path in paths:
+        yield path, None
+
+def read_jsonl(filename):
+    with open(filename, 'r', encoding='utf-8') as f:
+        for number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            if isinstance(record, str):
+                yield number, record
+            elif not isinstance(record, dict):
+                raise ValueError(f"{filename}:{number}: se esperaba un texto o un objeto JSON")
+            else:
+                text = record.get('text', record.get('expresion'))
+                if not isinstance(text, str):
+                    raise ValueError(f"{filename}:{number}: falta el campo 'text'")
+                yield record.get('id', number), text
+
+def check_text(text, compiled):
+    """Analiza `text`; devuelve None si es válido o la excepción (LexerError/ParseError)."""
+    try:
+        backend.LL1Parser(compiled, backend.Lexer(text).tokenize_buffer(), backend.START_SYMBOL).parse()
+    except (backend.LexerError, backend.ParseError) as e:
+        return e
+    return None
+
+def error_fields(error, text):
+    """Campos de diagnóstico (mensaje, offset, línea, columna) de un error de análisis."""
+    fields = {'error': str(error), 'pos': error.pos}
+    if isinstance(error, backend.LexerError):
+        fields['line'], fields['column'] = error.line, error.column
+    elif error.pos is not None:
+        fields['line'], fields['column'] = backend.Lexer(text).line_col(error.pos)
+    return fields
+
+def check_item(item, compiled):
+    """Resultado (dict listo para JSONL) de una expresión."""
+    item_id, text = item
+    start = time.perf_counter()
+    try:
+        if text is None:
+            with open(item_id, 'r', encoding='utf-8') as f:
+                text = f.read()
+        error = check_text(text, compiled)
+    except (OSError, UnicodeDecodeError) as e:
+        # Un archivo ilegible o que no es UTF-8 se informa sin detener el lote
+        error = e
+    elapsed = time.perf_counter() - start
+    result = {'id': item_id, 'ok': error is None}
+    if isinstance(error, (OSError, UnicodeDecodeError)):
+        result['error'] = f"No se pudo leer el archivo: {error}"
+    elif error is not None:
+        result.update(error_fields(error, text))
+    result['ms'] = round(elapsed * 1000, 4)
+    result['size'] = len(text) if text is not None else 0
+    return result
+
+def check_chunk(items):
+    """Tarea de un proceso: analiza un bloque de expresiones con la gramática del proceso."""
+    return [check_item(item, worker_grammar) for item in items]
+
+def chunked(items, size):
+    iterator = iter(items)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+def parse_batch(items, workers=None, chunk_size=CHUNK_SIZE, cache_dir=backend.CACHE_DIR):
+    """Analiza pares (id, texto) y genera sus resultados en el orden de entrada.
+
+    Con workers=1 todo corre en el proceso actual; si no, en un ProcessPoolExecutor
+    con `workers` procesos (por defecto uno por CPU). Los bloques se envían a
+    medida que se consumen los resultados, así la entrada puede ser muy grande.
+    """
+    # Se llena la caché en disco antes de crear los procesos, para que ninguno la recalcule
+    compiled = backend.load_grammar_tables(cache_dir=cache_dir, write_json=False).compiled
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        for item in items:
+            yield check_item(item, compiled)
+        return
+
+    for results in run_in_pool(check_chunk, chunked(items, chunk_size), workers, cache_dir):
+        yield from results
+
+def run_in_pool(function, tasks, workers, cache_dir=backend.CACHE_DIR):
+    """Ejecuta function(tarea) en un ProcessPoolExecutor y genera los resultados en orden.
+
+    Se envían tareas a medida que se consumen los resultados: como mucho
+    PENDING_PER_WORKER por proceso esperan en vuelo.
+    """
+    with ProcessPoolExecutor(workers, initializer=init_worker, initargs=(cache_dir,)) as executor:
+        pending = deque()
+        tasks = iter(tasks)
+        for task in itertools.islice(tasks, workers * PENDING_PER_WORKER):
+            pending.append(executor.submit(function, task))
+        while pending:
+            result = pending.popleft().result()
+            for task in itertools.islice(tasks, 1):
+                pending.append(executor.submit(function, task))
+            yield result
+
+# --- MODO DE SENTENCIAS (UN ARCHIVO, MUCHAS EXPRESIONES) ---
+# Las sentencias se separan por ';' o por saltos de línea fuera de paréntesis.
+# Para encontrar los cortes basta este patrón y un contador de profundidad: no
+# hace falta tokenizar. Un ';' siempre corta (no puede aparecer dentro de una
+# expresión), así un paréntesis sin cerrar no arrastra el resto del archivo.
+BOUNDARY_PATTERN = re.compile(r'[();\n]')
+
+def statement_boundaries(text, start=0, end=None):
+    """Offsets de los separadores (';' o salto de línea) que terminan una sentencia."""
+    depth = 0
+    for match in BOUNDARY_PATTERN.finditer(text, start, len(text) if end is None else end):
+        char = match.group()
+        if char == '(':
+            depth += 1
+        elif char == ')':
+            # Un ')' de más es un error de sintaxis de la sentencia, no del corte
+            if depth:
+                depth -= 1
+        elif char == ';':
+            depth = 0
+            yield match.start()
+        elif not depth:
+            yield match.start()
+
+def statement_spans(text, start=0, end=None):
+    """(inicio, fin) de cada sentencia no vacía entre start y end."""
+    end = len(text) if end is None else end
+    begin = start
+    for boundary in itertools.chain(statement_boundaries(text, start, end), (end,)):
+        if text[begin:boundary].strip():
+            yield begin, boundary
+        begin = boundary + 1
+
+def statement_chunks(text, chunk_chars=CHUNK_CHARS):
+    """Divide el texto en bloques de ~chunk_chars caracteres cortando solo entre sentencias.
+
+    Genera (texto del bloque, offset, línea, inicio de esa línea) con la posición
+    global del bloque, para que el proceso que lo analiza informe posiciones del archivo.
+    """
+    begin = 0
+    line = 1
+    line_start = 0
+    end = len(text)
+    cuts = (boundary + 1 for boundary in statement_boundaries(text))
+    for cut in itertools.chain(cuts, (end,)):
+        if cut - begin < chunk_chars and cut < end:
+            continue
+        if cut > begin:
+            yield text[begin:cut], begin, line, line_start
+            newlines = text.count('\n', begin, cut)
+            if newlines:
+                line += newlines
+                line_start = text.rfind('\n', begin, cut) + 1
+        begin = cut
+
+def check_statement_chunk(task, compiled=None):
+    """Analiza cada sentencia de un bloque; devuelve (cantidad de sentencias, resultados).
+
+    Los resultados traen posiciones globales; el número de sentencia es relativo al
+    bloque y lo completa parse_statements() al unir los bloques en orden.
+    """
+    text, base, line, line_start, include_ok = task
+    compiled = compiled or worker_grammar
+    count = 0
+    results = []
+    for count, (start, end) in enumerate(statement_spans(text), 1):
+        error = check_text(text[start:end], compiled)
+        if error is None:
+            if include_ok:
+                results.append({'statement': count, 'ok': True, 'pos': base + start})
+            continue
+        result = {'statement': count, 'ok': False, 'error': str(error), 'pos': None}
+        if error.pos is not None:
+            pos = start + error.pos
+            result['pos'] = base + pos
+            newlines = text.count('\n', 0, pos)
+            result['line'] = line + newlines
+            result['column'] = pos - text.rfind('\n', 0, pos) if newlines else base + pos - line_start + 1
+        results.append(result)
+    return count, results
+
+def parse_statements(text, workers=None, chunk_chars=CHUNK_CHARS, include_ok=False, summary=None,
+                     cache_dir=backend.CACHE_DIR):
+    """Valida un texto con muchas sentencias repartiendo bloques entre procesos.
+
+    Genera un resultado por sentencia con error (o por cada una con include_ok),
+    en el orden del archivo y con offset, línea y columna globales. Si se entrega
+    el dict `summary`, su clave 'statements' lleva la cuenta de sentencias analizadas.
+    """
+    compiled = backend.load_grammar_tables(cache_dir=cache_dir, write_json=False).compiled
+    workers = workers or os.cpu_count() or 1
+    tasks = ((*chunk, include_ok) for chunk in statement_chunks(text, chunk_chars))
+    if workers == 1:
+        chunks = (check_statement_chunk(task, compiled) for task in tasks)
+    else:
+        chunks = run_in_pool(check_statement_chunk, tasks, workers, cache_dir)
+    first = 0
+    for count, results in chunks:
+        for result in results:
+            result['statement'] += first
+            yield result
+        first += count
+        if summary is not None:
+            summary['statements'] = first
+
+# --- EJECUCIÓN PRINCIPAL ---
+if __name__ == '__main__':
+    arg_parser = argparse.ArgumentParser(description="Analiza expresiones por lotes en varios procesos (salida JSONL)")
+    arg_parser.add_argument('entrada', help="Directorio, patrón glob o archivo .jsonl con expresiones (con --sentencias, un archivo)")
+    arg_parser.add_argument('--procesos', type=int, default=None, help="Procesos a usar (por defecto uno por CPU)")
+    arg_parser.add_argument('--bloque', type=int, default=CHUNK_SIZE, help="Expresiones por tarea enviada a cada proceso")
+    arg_parser.add_argument('--sentencias', action='store_true', help="La entrada es un solo archivo con una expresión por línea o separadas por ';'")
+    arg_parser.add_argument('--todas', action='store_true', help="Con --sentencias, informar también las sentencias correctas")
+    arg_parser.add_argument('--salida', help="Archivo JSONL de resultados (por defecto la salida estándar)")
+    args = arg_parser.parse_args()
+
+    out = open(args.salida, 'w', encoding='utf-8') if args.salida else sys.stdout
+    total = errors = size = 0
+    start = time.perf_counter()
+    try:
+        if args.sentencias:
+            # Sin read_source_file(): esa función crea el archivo si no existe
+            with open(args.entrada, 'r', encoding='utf-8') as f:
+                text = f.read()
+            size = len(text)
+            summary = {'statements': 0}
+            results = parse_statements(text, args.procesos, include_ok=args.todas, summary=summary)
+        else:
+            results = parse_batch(read_items(args.entrada), args.procesos, args.bloque)
+        for result in results:
+            out.write(json.dumps(result, ensure_ascii=False) + "\n")
+            errors += not result['ok']
+            if not args.sentencias:
+                total += 1
+                size += result['size']
+        if args.sentencias:
+            total = summary['statements']
+    except (OSError, ValueError) as e:
+        # Entrada inexistente, ilegible o JSONL mal formado
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    elapsed = time.perf_counter() - start
+    rate = total / elapsed if elapsed else 0.0
+    print(f"{total} expresiones ({errors} con errores) en {elapsed:.3f} s: "
+          f"{rate:,.0f} expr/s, {size / elapsed / 1e6 if elapsed else 0:.2f} MB/s", file=sys.stderr)
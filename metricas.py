@@ -0,0 +1,137 @@
+import cProfile
+import io
+import pstats
+import tracemalloc
+from collections import deque
+from time import perf_counter
+
+import proyecto_final as backend
+
+# -------------------------------------------------
+# Métricas del parser
+# ParseMetrics acumula contadores de una gramática compilada a lo largo de
+# muchos análisis. Solo se paga su costo cuando se pasa a
+# LL1Parser.parse(metrics=...); sin métricas el parser usa su ciclo normal.
+# -------------------------------------------------
+
+PROFILERS = ('cprofile', 'tracemalloc')
+PROFILE_LINES = 25       # Filas de cada informe de perfil
+KEPT_PROFILES = 10       # Informes de análisis lentos que se conservan
+
+class ParseMetrics:
+    """Contadores por producción y por tipo de token, profundidad máxima de la pila
+    y tiempo repartido entre lexer y parser.
+
+    Con `profile` ('cprofile' o 'tracemalloc') cada análisis se perfila y, si tarda
+    al menos `slow_seconds`, su informe se guarda en `profiles`. No es seguro
+    compartir una instancia entre hilos: conviene una por hilo.
+    """
+    def __init__(self, compiled, profile=None, slow_seconds=0.0):
+        if profile is not None and profile not in PROFILERS:
+            raise ValueError(f"Perfilador desconocido: {profile} (opciones: {', '.join(PROFILERS)})")
+        self.grammar = compiled
+        self.profile = profile
+        self.slow_seconds = slow_seconds
+        self.profiles = deque(maxlen=KEPT_PROFILES)
+        self.reset()
+
+    def reset(self):
+        self.production_counts = [0] * len(self.grammar.productions)
+        self.token_counts = [0] * self.grammar.stride
+        self.max_stack_depth = 0
+        self.lexer_seconds = 0.0
+        self.total_seconds = 0.0
+        self.parses = 0
+        self.errors = 0
+
+    @property
+    def parser_seconds(self):
+        return self.total_seconds - self.lexer_seconds
+
+    def observe(self, parser):
+        """Ejecuta parser.parse_instrumented(self) midiendo el tiempo (y el perfil si corresponde)."""
+        profiler = None
+        if self.profile == 'cprofile':
+            profiler = cProfile.Profile()
+            profiler.enable()
+        elif self.profile == 'tracemalloc':
+            started_tracing = not tracemalloc.is_tracing()
+            if started_tracing:
+                tracemalloc.start()
+            snapshot = tracemalloc.take_snapshot()
+        start = perf_counter()
+        try:
+            return parser.parse_instrumented(self)
+        except Exception:
+            self.errors += 1
+            raise
+        finally:
+            elapsed = perf_counter() - start
+            self.total_seconds += elapsed
+            self.parses += 1
+            if profiler is not None:
+                profiler.disable()
+                if elapsed >= self.slow_seconds:
+                    self.profiles.append((elapsed, cprofile_report(profiler)))
+            elif self.profile == 'tracemalloc':
+                if elapsed >= self.slow_seconds:
+                    self.profiles.append((elapsed, tracemalloc_report(tracemalloc.take_snapshot(), snapshot)))
+                if started_tracing:
+                    tracemalloc.stop()
+
+    def as_dict(self):
+        """Métricas con nombres legibles, listas para JSON."""
+        grammar = self.grammar
+        productions = {}
+        for (nt, production), count in zip(grammar.productions, self.production_counts):
+            if count:
+                productions[f"{nt} -> {' '.join(production)}"] = count
+        tokens = {grammar.symbols[kind]: count for kind, count in enumerate(self.token_counts[:grammar.n_terminals]) if count}
+        return {
+            'parses': self.parses,
+            'errors': self.errors,
+            'productions': productions,
+            'tokens': tokens,
+            'max_stack_depth': self.max_stack_depth,
+            'lexer_seconds': self.lexer_seconds,
+            'parser_seconds': self.parser_seconds,
+        }
+
+    def prometheus(self, prefix='ll1'):
+        """Métricas en el formato de texto de Prometheus."""
+        data = self.as_dict()
+        lines = []
+
+        def metric(name, kind, help_text, samples):
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+            for labels, value in samples:
+                lines.append(f"{prefix}_{name}{labels} {value}")
+
+        metric('parses_total', 'counter', "Análisis ejecutados", [('', data['parses'])])
+        metric('parse_errors_total', 'counter', "Análisis que terminaron con error", [('', data['errors'])])
+        metric('production_total', 'counter', "Veces que se aplicó cada producción",
+               [(f'{{production="{escape_label(name)}"}}', count) for name, count in data['productions'].items()])
+        metric('tokens_total', 'counter', "Tokens consumidos por tipo",
+               [(f'{{kind="{escape_label(kind)}"}}', count) for kind, count in data['tokens'].items()])
+        metric('max_stack_depth', 'gauge', "Profundidad máxima de la pila del parser", [('', data['max_stack_depth'])])
+        metric('seconds_total', 'counter', "Tiempo de análisis por fase",
+               [('{phase="lexer"}', data['lexer_seconds']), ('{phase="parser"}', data['parser_seconds'])])
+        return "\n".join(lines) + "\n"
+
+def escape_label(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def cprofile_report(profiler):
+    out = io.StringIO()
+    pstats.Stats(profiler, stream=out).sort_stats('cumulative').print_stats(PROFILE_LINES)
+    return out.getvalue()
+
+def tracemalloc_report(snapshot, before):
+    stats = snapshot.compare_to(before, 'lineno')[:PROFILE_LINES]
+    return "\n".join(str(stat) for stat in stats)
+
+def parse_with_metrics(text, metrics):
+    """Tokeniza y analiza `text` acumulando en `metrics`; devuelve True o lanza el error."""
+    parser = backend.LL1Parser(metrics.grammar, backend.Lexer(text), backend.START_SYMBOL)
+    return parser.parse(metrics=metrics)
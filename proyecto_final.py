@@ -1,5 +1,15 @@
+import argparse
+import codecs
+import hashlib
 import json
+import mmap
 import os
+import re
+import sys
+from array import array
+from bisect import bisect_right
+from contextlib import contextmanager, nullcontext
+from time import perf_counter
 
 # -------------------------------------------------
 # Proyecto 01 - Teoría de la Computación
@@ -19,16 +29,282 @@ TOKEN_RPAREN = 'RPAREN'
 TOKEN_EOF = '$'  # Fin de archivo
 TOKEN_EPSILON = 'ε' # Epsilon (vacío)
 
+# Códigos enteros pequeños de cada tipo de token (para buffers compactos)
+TOKEN_KINDS = (TOKEN_NUM, TOKEN_ID, TOKEN_PLUS, TOKEN_MINUS, TOKEN_MUL,
+               TOKEN_DIV, TOKEN_MOD, TOKEN_LPAREN, TOKEN_RPAREN, TOKEN_EOF)
+KIND_OF = {token_type: kind for kind, token_type in enumerate(TOKEN_KINDS)}
+KIND_NUM = KIND_OF[TOKEN_NUM]
+KIND_ID = KIND_OF[TOKEN_ID]
+KIND_EOF = KIND_OF[TOKEN_EOF]
+
 # --- CLASE TOKEN ---
 class Token:
-    def __init__(self, type, value):
+    # Sin __dict__ por instancia: solo los tres campos.
+    __slots__ = ('type', 'lexeme', 'pos')
+
+    def __init__(self, type, lexeme, pos=None):
         self.type = type
-        self.value = value
+        self.lexeme = lexeme
+        self.pos = pos  # Offset del token dentro del texto fuente
+
+    @property
+    def value(self):
+        # El valor numérico se materializa solo cuando alguien lo lee.
+        if self.type == TOKEN_NUM:
+            return float(self.lexeme)
+        return self.lexeme
+
     def __str__(self):
         return f'Token({self.type}, {repr(self.value)})'
 
+class TokenBuffer:
+    """Flujo de tokens en columnas: tipos como enteros pequeños y offsets (inicio, fin) en el texto.
+
+    Se comporta como un lexer (get_next_token) para poder pasarlo a LL1Parser.
+    """
+    def __init__(self, text, kinds, starts, ends):
+        self.text = text
+        self.kinds = kinds
+        self.starts = starts
+        self.ends = ends
+        self.cursor = 0
+
+    def __len__(self):
+        return len(self.kinds)
+
+    def type(self, i):
+        return TOKEN_KINDS[self.kinds[i]]
+
+    def lexeme(self, i):
+        if self.kinds[i] == KIND_EOF:
+            return None
+        return self.text[self.starts[i]:self.ends[i]]
+
+    def value(self, i):
+        lexeme = self.lexeme(i)
+        if self.kinds[i] == KIND_NUM:
+            return float(lexeme)
+        return lexeme
+
+    def __getitem__(self, i):
+        return Token(TOKEN_KINDS[self.kinds[i]], self.lexeme(i), self.starts[i])
+
+    def __iter__(self):
+        for i in range(len(self.kinds)):
+            yield self[i]
+
+    def rewind(self):
+        self.cursor = 0
+
+    def get_next_token(self):
+        i = self.cursor
+        if i < len(self.kinds) - 1:
+            self.cursor = i + 1
+        return self[i]
+
+class LexerError(Exception):
+    """Error léxico con la posición (offset, línea y columna) del caracter inválido."""
+    def __init__(self, char, pos, line, column):
+        super().__init__(f'Error léxico: Caracter no válido "{char}" en línea {line}, columna {column}')
+        self.char = char
+        self.pos = pos
+        self.line = line
+        self.column = column
+
 # --- CLASE LEXER (ANALIZADOR LÉXICO) ---
+# Patrón maestro: cada match consume los espacios previos y un token completo.
+# El grupo que participa (m.lastindex) indica el tipo, sin cadena de if por caracter.
+TOKEN_PATTERN = re.compile(r'\s*(?:(\d+(?:\.\d*)?)|([^\W\d]\w*)|([-+*/%()])|(\S))')
+GROUP_NUM, GROUP_ID, GROUP_OP, GROUP_ERROR = 1, 2, 3, 4
+
+OPERATOR_TOKENS = {
+    '+': TOKEN_PLUS, '-': TOKEN_MINUS, '*': TOKEN_MUL, '/': TOKEN_DIV,
+    '%': TOKEN_MOD, '(': TOKEN_LPAREN, ')': TOKEN_RPAREN,
+}
+OPERATOR_KINDS = {char: KIND_OF[token_type] for char, token_type in OPERATOR_TOKENS.items()}
+
 class Lexer:
+    def __init__(self, text):
+        self.text = text
+        self.pos = 0
+        # Fin efectivo: se ignoran los espacios finales para que el patrón
+        # nunca tenga que reintentar sobre ellos.
+        end = len(text)
+        while end and text[end - 1].isspace():
+            end -= 1
+        self.end = end
+
+    def line_col(self, pos):
+        """Devuelve (línea, columna), ambas desde 1, para un offset del texto."""
+        line = self.text.count('\n', 0, pos) + 1
+        column = pos - self.text.rfind('\n', 0, pos)
+        return line, column
+
+    def error(self, char, pos):
+        # Se avanza tras el caracter inválido para que el lexer pueda continuar.
+        self.pos = pos + 1
+        line, column = self.line_col(pos)
+        raise LexerError(char, pos, line, column)
+
+    def get_next_token(self):
+        match = TOKEN_PATTERN.match(self.text, self.pos, self.end)
+        if match is None:
+            self.pos = self.end
+            return Token(TOKEN_EOF, None, self.end)
+        group = match.lastindex
+        start = match.start(group)
+        if group == GROUP_OP:
+            self.pos = start + 1
+            char = self.text[start]
+            return Token(OPERATOR_TOKENS[char], char, start)
+        if group == GROUP_ERROR:
+            self.error(self.text[start], start)
+        self.pos = match.end()
+        if group == GROUP_ID:
+            return Token(TOKEN_ID, match.group(group), start)
+        return Token(TOKEN_NUM, match.group(group), start)
+
+    def tokenize(self):
+        """Tokeniza todo el texto restante en una sola pasada (incluye el token EOF)."""
+        tokens = []
+        append = tokens.append
+        text = self.text
+        for match in TOKEN_PATTERN.finditer(text, self.pos, self.end):
+            group = match.lastindex
+            start = match.start(group)
+            if group == GROUP_OP:
+                char = text[start]
+                append(Token(OPERATOR_TOKENS[char], char, start))
+            elif group == GROUP_ID:
+                append(Token(TOKEN_ID, match.group(group), start))
+            elif group == GROUP_NUM:
+                append(Token(TOKEN_NUM, match.group(group), start))
+            else:
+                self.error(text[start], start)
+        self.pos = self.end
+        append(Token(TOKEN_EOF, None, self.end))
+        return tokens
+
+    def tokenize_buffer(self):
+        """Como tokenize(), pero devuelve un TokenBuffer compacto en lugar de objetos Token."""
+        text = self.text
+        # Offsets de 4 bytes mientras el texto lo permita
+        offset_code = 'I' if self.end < 2 ** 32 else 'Q'
+        kinds = array('B')
+        starts = array(offset_code)
+        ends = array(offset_code)
+        add_kind, add_start, add_end = kinds.append, starts.append, ends.append
+        for match in TOKEN_PATTERN.finditer(text, self.pos, self.end):
+            group = match.lastindex
+            start = match.start(group)
+            if group == GROUP_OP:
+                add_kind(OPERATOR_KINDS[text[start]])
+                add_start(start)
+                add_end(start + 1)
+                continue
+            if group == GROUP_ERROR:
+                self.error(text[start], start)
+            add_kind(KIND_ID if group == GROUP_ID else KIND_NUM)
+            add_start(start)
+            add_end(match.end())
+        self.pos = self.end
+        add_kind(KIND_EOF)
+        add_start(self.end)
+        add_end(self.end)
+        return TokenBuffer(text, kinds, starts, ends)
+
+# --- LEXER POR BLOQUES (ENTRADAS GRANDES) ---
+CHUNK_SIZE = 1 << 16  # 64 KiB por lectura
+WHITESPACE_PATTERN = re.compile(r'\s*')
+
+class StreamLexer:
+    """Lexer que lee la entrada por bloques desde un archivo (texto o binario) o un mmap.
+
+    Solo mantiene en memoria el bloque actual más el token que esté a medias,
+    así que el consumo no depende del tamaño del archivo.
+    """
+    def __init__(self, source, chunk_size=CHUNK_SIZE):
+        self.source = source
+        self.chunk_size = chunk_size
+        self.buffer = ''
+        self.base = 0          # Offset global de buffer[0]
+        self.pos = 0           # Posición dentro del buffer
+        self.exhausted = False
+        self.decoder = None    # Solo si la fuente entrega bytes
+        self.released = 0      # Bytes del mmap ya devueltos al sistema
+        self.line = 1          # Línea de buffer[0]
+        self.line_start = 0    # Offset global donde empieza esa línea
+        self.last_end = 0      # Offset global tras el último token (posición del EOF, como en Lexer)
+
+    def fill(self):
+        """Descarta lo ya consumido y agrega el siguiente bloque de la fuente."""
+        data = self.source.read(self.chunk_size)
+        if not data:
+            self.exhausted = True
+        elif isinstance(self.source, mmap.mmap) and hasattr(mmap, 'MADV_DONTNEED'):
+            # Las páginas ya leídas del mmap se liberan para que el RSS no crezca
+            released = self.source.tell() // mmap.PAGESIZE * mmap.PAGESIZE - mmap.PAGESIZE
+            if released > self.released:
+                self.source.madvise(mmap.MADV_DONTNEED, self.released, released - self.released)
+                self.released = released
+        if isinstance(data, bytes):
+            if self.decoder is None:
+                self.decoder = codecs.getincrementaldecoder('utf-8')()
+            data = self.decoder.decode(data, final=self.exhausted)
+        if self.pos:
+            newline = self.buffer.rfind('\n', 0, self.pos)
+            if newline >= 0:
+                self.line += self.buffer.count('\n', 0, self.pos)
+                self.line_start = self.base + newline + 1
+            self.base += self.pos
+            self.buffer = self.buffer[self.pos:]
+            self.pos = 0
+        self.buffer += data
+
+    def line_col(self, pos):
+        rel = pos - self.base
+        line = self.line + self.buffer.count('\n', 0, rel)
+        newline = self.buffer.rfind('\n', 0, rel)
+        line_start = self.base + newline + 1 if newline >= 0 else self.line_start
+        return line, pos - line_start + 1
+
+    def error(self, char, pos):
+        self.pos = pos - self.base + 1
+        self.last_end = pos + 1
+        line, column = self.line_col(pos)
+        raise LexerError(char, pos, line, column)
+
+    def get_next_token(self):
+        while True:
+            # Los espacios se saltan aparte y se marcan como consumidos: fill() los descarta
+            # (contando sus saltos de línea), así un tramo largo de espacios no se acumula
+            self.pos = WHITESPACE_PATTERN.match(self.buffer, self.pos).end()
+            if self.pos == len(self.buffer):
+                if self.exhausted:
+                    # EOF justo después del último token, igual que Lexer
+                    return Token(TOKEN_EOF, None, self.last_end)
+                self.fill()
+                continue
+            match = TOKEN_PATTERN.match(self.buffer, self.pos)
+            if match.end() == len(self.buffer) and not self.exhausted:
+                # El token toca el final del bloque: podría continuar en el siguiente
+                self.fill()
+                continue
+            break
+        group = match.lastindex
+        start = match.start(group)
+        if group == GROUP_ERROR:
+            self.error(self.buffer[start], self.base + start)
+        self.pos = match.end()
+        self.last_end = self.base + self.pos
+        if group == GROUP_OP:
+            char = self.buffer[start]
+            return Token(OPERATOR_TOKENS[char], char, self.base + start)
+        return Token(TOKEN_ID if group == GROUP_ID else TOKEN_NUM, match.group(group), self.base + start)
+
+# Implementación original caracter a caracter. Se conserva como referencia
+# para comparar rendimiento y resultados con el Lexer basado en el patrón maestro.
+class CharLexer:
     def __init__(self, text):
         self.text = text
         self.pos = 0
@@ -116,8 +392,188 @@ NON_TERMINALS = set(GRAMMAR.keys())
 
 # --- ALGORITMOS GENERADORES (FIRST, FOLLOW, TABLA) ---
 
+def strongly_connected_components(nodes, edges):
+    """Componentes fuertemente conexas (Tarjan iterativo, sin recursión).
+
+    Se devuelven en orden topológico inverso: cada componente aparece después
+    de todas las componentes que alcanza.
+    """
+    index = {}
+    low = {}
+    on_stack = set()
+    stack = []
+    components = []
+    counter = 0
+    for root in nodes:
+        if root in index:
+            continue
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack.add(root)
+        work = [(root, iter(edges.get(root, ())))]
+        while work:
+            node, successors = work[-1]
+            for successor in successors:
+                if successor not in index:
+                    index[successor] = low[successor] = counter
+                    counter += 1
+                    stack.append(successor)
+                    on_stack.add(successor)
+                    work.append((successor, iter(edges.get(successor, ()))))
+                    break
+                if successor in on_stack and index[successor] < low[node]:
+                    low[node] = index[successor]
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    if low[node] < low[parent]:
+                        low[parent] = low[node]
+                if low[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    components.append(component)
+    return components
+
+def propagate_sets(nodes, direct, edges):
+    """Para cada nodo, une su conjunto directo con los de todos los nodos que alcanza.
+
+    Cada componente fuerte comparte un mismo resultado, y las componentes se procesan
+    una sola vez en orden topológico inverso, así que no hay pasadas repetidas.
+    """
+    component_of = {}
+    component_sets = []
+    for component in strongly_connected_components(nodes, edges):
+        number = len(component_sets)
+        for node in component:
+            component_of[node] = number
+        result = set()
+        for node in component:
+            result |= direct[node]
+            for successor in edges.get(node, ()):
+                other = component_of[successor]
+                if other != number:
+                    result |= component_sets[other]
+        component_sets.append(result)
+    return {node: set(component_sets[component_of[node]]) for node in nodes}
+
+def nullable_non_terminals(grammar):
+    """No-terminales anulables, con una lista de trabajo que solo revisa las producciones afectadas."""
+    pending = []       # Símbolos de cada producción que aún no se sabe si son anulables
+    heads = []
+    occurrences = {nt: [] for nt in grammar}
+    worklist = []
+    for nt, productions in grammar.items():
+        for production in productions:
+            number = len(heads)
+            heads.append(nt)
+            count = 0
+            for symbol in production:
+                if symbol == TOKEN_EPSILON:
+                    continue
+                if symbol in grammar:
+                    occurrences[symbol].append(number)
+                count += 1  # Un terminal nunca llega a cero: la producción no es anulable
+            pending.append(count)
+            if count == 0:
+                worklist.append(nt)
+    nullable = set()
+    while worklist:
+        nt = worklist.pop()
+        if nt in nullable:
+            continue
+        nullable.add(nt)
+        for number in occurrences[nt]:
+            pending[number] -= 1
+            if pending[number] == 0:
+                worklist.append(heads[number])
+    return nullable
+
 def calculate_first_sets(grammar, non_terminals):
-    """Calcula el conjunto First de forma iterativa."""
+    """Calcula el conjunto First sobre el grafo de dependencias entre no-terminales.
+
+    Todo símbolo que no es no-terminal ni epsilon se trata como terminal.
+    """
+    nullable = nullable_non_terminals(grammar)
+    direct = {nt: set() for nt in non_terminals}
+    edges = {nt: [] for nt in non_terminals}
+    for nt in non_terminals:
+        for production in grammar[nt]:
+            # Solo importa el prefijo anulable de la producción
+            for symbol in production:
+                if symbol == TOKEN_EPSILON:
+                    continue
+                if symbol in non_terminals:
+                    edges[nt].append(symbol)
+                    if symbol not in nullable:
+                        break
+                else:
+                    direct[nt].add(symbol)
+                    break
+    first_sets = propagate_sets(non_terminals, direct, edges)
+    for nt in nullable:
+        if nt in first_sets:
+            first_sets[nt].add(TOKEN_EPSILON)
+    return first_sets
+
+def first_of_sequence(symbols, first_sets, memo=None):
+    """First de una secuencia de símbolos; incluye epsilon si toda la secuencia es anulable."""
+    key = tuple(symbols)
+    if memo is not None and key in memo:
+        return memo[key]
+    result = set()
+    for symbol in key:
+        first_of_symbol = first_sets.get(symbol, {symbol})
+        result |= first_of_symbol
+        if TOKEN_EPSILON not in first_of_symbol:
+            result.discard(TOKEN_EPSILON)
+            break
+    else:
+        result.add(TOKEN_EPSILON)
+    if memo is not None:
+        memo[key] = result
+    return result
+
+def calculate_follow_sets(grammar, start_symbol, first_sets):
+    """Calcula el conjunto Follow sobre el grafo de dependencias entre no-terminales."""
+    direct = {nt: set() for nt in grammar}
+    edges = {nt: [] for nt in grammar}
+    direct[start_symbol].add(TOKEN_EOF)
+    for nt, productions in grammar.items():
+        for production in productions:
+            # Recorrido de derecha a izquierda: First del sufijo se arma una sola vez por producción
+            trailer = set()
+            trailer_nullable = True
+            for symbol in reversed(production):
+                if symbol == TOKEN_EPSILON:
+                    continue
+                if symbol in grammar:
+                    direct[symbol] |= trailer
+                    if trailer_nullable:
+                        # Producción A -> alpha B beta con beta anulable: Follow(A) ⊆ Follow(B)
+                        edges[symbol].append(nt)
+                    first_of_symbol = first_sets[symbol]
+                    if TOKEN_EPSILON in first_of_symbol:
+                        trailer = trailer | first_of_symbol
+                        trailer.discard(TOKEN_EPSILON)
+                    else:
+                        trailer = first_of_symbol - {TOKEN_EPSILON}
+                        trailer_nullable = False
+                else:
+                    trailer = {symbol}
+                    trailer_nullable = False
+    return propagate_sets(list(grammar), direct, edges)
+
+# Implementaciones originales por punto fijo. Se conservan como referencia
+# para verificar y comparar rendimiento con las versiones basadas en grafos.
+def calculate_first_sets_naive(grammar, non_terminals):
+    """Calcula el conjunto First de forma iterativa (punto fijo que recorre todo en cada pasada)."""
     first_sets = {nt: set() for nt in non_terminals}
     
     while True:
@@ -155,8 +611,10 @@ def calculate_first_sets(grammar, non_terminals):
             break
     return first_sets
 
-def calculate_follow_sets(grammar, start_symbol, first_sets):
-    """Calcula el conjunto Follow de forma iterativa."""
+def calculate_follow_sets_naive(grammar, start_symbol, first_sets):
+    """Calcula el conjunto Follow de forma iterativa (punto fijo que recorre todo en cada pasada)."""
+    # Los no-terminales se toman de la propia gramática para poder comparar con otras gramáticas
+    NON_TERMINALS = set(grammar)
     follow_sets = {nt: set() for nt in NON_TERMINALS}
     follow_sets[start_symbol].add(TOKEN_EOF) 
 
@@ -196,19 +654,13 @@ def calculate_follow_sets(grammar, start_symbol, first_sets):
 
 def build_ll1_table(grammar, first_sets, follow_sets):
     """Construye la tabla de análisis sintáctico LL(1)."""
-    table = {nt: {} for nt in NON_TERMINALS}
+    table = {nt: {} for nt in grammar}
+    memo = {}
     
-    for nt in NON_TERMINALS:
+    for nt in grammar:
         for production in grammar[nt]:
             # Calcular First de la producción actual
-            first_of_production = set()
-            for symbol in production:
-                first_of_symbol = first_sets[symbol] if symbol in NON_TERMINALS else {symbol}
-                first_of_production.update(first_of_symbol - {TOKEN_EPSILON})
-                if TOKEN_EPSILON not in first_of_symbol:
-                    break
-            else:
-                first_of_production.add(TOKEN_EPSILON)
+            first_of_production = first_of_sequence(production, first_sets, memo)
 
             # Regla 1: Para cada terminal en First(prod)
             for terminal in first_of_production:
@@ -224,110 +676,951 @@ def build_ll1_table(grammar, first_sets, follow_sets):
 
     return table
 
+# --- ÁRBOL SINTÁCTICO (AST) ---
+# Nodos compactos (sin __dict__) que LL1Parser.parse_ast() arma durante el mismo análisis.
+class NumberNode:
+    __slots__ = ('value',)
+
+    def __init__(self, value):
+        self.value = value
+
+class VariableNode:
+    __slots__ = ('name',)
+
+    def __init__(self, name):
+        self.name = name
+
+class BinaryNode:
+    __slots__ = ('op', 'left', 'right')
+
+    def __init__(self, op, left, right):
+        self.op = op
+        self.left = left
+        self.right = right
+
+# Una producción que empieza con uno de estos terminales (E' -> PLUS T E') combina
+# los dos últimos operandos apenas termina su segundo símbolo: asociatividad izquierda.
+BINARY_OPERATORS = {TOKEN_PLUS: '+', TOKEN_MINUS: '-', TOKEN_MUL: '*', TOKEN_DIV: '/', TOKEN_MOD: '%'}
+AST_OPERATORS = tuple(BINARY_OPERATORS.values())
+
+# --- GRAMÁTICA COMPILADA (SÍMBOLOS ENTEROS) ---
+class CompiledGrammar:
+    """Tabla LL(1) con los símbolos internados como enteros pequeños.
+
+    Los terminales ocupan los ids 0..n_terminals-1 (en el orden de TOKEN_KINDS, de modo
+    que coinciden con los códigos de TokenBuffer) y los no-terminales van a continuación.
+    La tabla es plana: table[(nt - n_terminals) * stride + terminal] da el índice de la
+    producción o -1. La columna extra (stride - 1) recibe los tipos de token desconocidos.
+    """
+    def __init__(self, symbols, n_terminals, start, table, productions):
+        self.symbols = symbols
+        self.symbol_id = {name: i for i, name in enumerate(symbols)}
+        self.terminal_id = {name: i for i, name in enumerate(symbols[:n_terminals])}
+        self.n_terminals = n_terminals
+        self.stride = n_terminals + 1
+        self.unknown = n_terminals
+        self.start = start
+        self.eof = self.symbol_id[TOKEN_EOF]
+        self.table = table
+        # (no-terminal, producción) en nombres, para trazas y para el JSON legible
+        self.productions = productions
+        # Lado derecho invertido y sin epsilon, listo para stack.extend()
+        self.rhs = [tuple(self.symbol_id[s] for s in reversed(production) if s != TOKEN_EPSILON)
+                    for _, production in productions]
+        # Como rhs, pero con marcas negativas (-1 - índice en AST_OPERATORS) donde se arma un BinaryNode
+        self.ast_rhs = []
+        for _, production in productions:
+            symbols_of_production = [self.symbol_id[s] for s in production if s != TOKEN_EPSILON]
+            if production[0] in BINARY_OPERATORS and len(symbols_of_production) >= 2:
+                marker = -1 - AST_OPERATORS.index(BINARY_OPERATORS[production[0]])
+                symbols_of_production.insert(2, marker)
+            self.ast_rhs.append(tuple(reversed(symbols_of_production)))
+        # Los ids de terminales coinciden con los códigos de TokenBuffer y la gramática
+        # no usa terminales que el Lexer no produce (compile_grammar los agrega tras TOKEN_KINDS)
+        self.uses_token_kinds = tuple(symbols[:n_terminals]) == TOKEN_KINDS
+
+    def kind_of(self, token_type):
+        return self.terminal_id.get(token_type, self.unknown)
+
+class SparseLL1Table:
+    """Tabla LL(1) comprimida por desplazamiento de filas (comb vector).
+
+    Las entradas de cada fila se guardan en los vectores compartidos `value`/`check`,
+    desplazadas por base[fila] para encajar en los huecos de las demás filas; check
+    indica a qué fila pertenece cada casilla. Lo que no está guardado vale default[fila]:
+    -1 (error) o, con reducción por defecto, la producción más frecuente de la fila.
+    Con reducción por defecto los errores se detectan más tarde (al comparar un terminal),
+    como es habitual en tablas comprimidas.
+
+    Se indexa igual que la tabla plana (fila * stride + columna), así que el parser la usa sin cambios.
+    """
+    def __init__(self, stride, default, base, value, check):
+        self.stride = stride
+        self.default = default
+        self.base = base
+        self.value = value
+        self.check = check
+
+    def lookup(self, row, column):
+        i = self.base[row] + column
+        if self.check[i] == row:
+            return self.value[i]
+        return self.default[row]
+
+    def __getitem__(self, index):
+        row, column = divmod(index, self.stride)
+        return self.lookup(row, column)
+
+    def __len__(self):
+        return len(self.default) * self.stride
+
+    def nbytes(self):
+        return sum(len(a) * a.itemsize for a in (self.default, self.base, self.value, self.check))
+
+PLACEMENT_TRIES = 64
+
+def compress_table(flat, stride, default_reduction=False):
+    """Comprime una tabla plana en una SparseLL1Table (ubicación first-fit de las filas)."""
+    n_rows = len(flat) // stride
+    default = array(flat.typecode, [-1]) * n_rows
+    rows = []
+    for row in range(n_rows):
+        cells = flat[row * stride:(row + 1) * stride]
+        if default_reduction:
+            counts = {}
+            for production in cells:
+                if production >= 0:
+                    counts[production] = counts.get(production, 0) + 1
+            if counts:
+                default[row] = max(counts, key=counts.get)
+        # Las casillas de error también toman el valor por defecto
+        entries = [(column, production) for column, production in enumerate(cells)
+                   if production >= 0 and production != default[row]]
+        rows.append((row, entries))
+
+    # Las filas más llenas se ubican primero; las demás rellenan los huecos
+    rows.sort(key=lambda item: -len(item[1]))
+    base = array('i', [0]) * n_rows
+    value = array(flat.typecode)
+    check = array('h' if n_rows < 2 ** 15 else 'i')
+    occupied = bytearray()
+    for row, entries in rows:
+        if not entries:
+            continue
+        first_column = entries[0][0]
+        # Candidatos: desplazamientos que dejan la primera entrada en una casilla libre.
+        # Tras PLACEMENT_TRIES intentos la fila se ubica al final, donde siempre cabe.
+        offset = None
+        free = occupied.find(0, first_column)
+        for _ in range(PLACEMENT_TRIES):
+            if free < 0:
+                break
+            candidate = free - first_column
+            if all(candidate + column >= len(occupied) or not occupied[candidate + column] for column, _ in entries):
+                offset = candidate
+                break
+            free = occupied.find(0, free + 1)
+        if offset is None:
+            offset = max(0, len(occupied) - first_column)
+        base[row] = offset
+        needed = offset + stride - len(check)
+        if needed > 0:
+            value.extend(array(flat.typecode, [-1]) * needed)
+            check.extend(array(check.typecode, [-1]) * needed)
+            occupied.extend(bytes(needed))
+        for column, production in entries:
+            value[offset + column] = production
+            check[offset + column] = row
+            occupied[offset + column] = 1
+    # Las filas vacías quedan en base 0; se garantiza que base + columna siempre esté en rango
+    needed = stride - len(check)
+    if needed > 0:
+        value.extend(array(flat.typecode, [-1]) * needed)
+        check.extend(array(check.typecode, [-1]) * needed)
+    return SparseLL1Table(stride, default, base, value, check)
+
+def compile_grammar(table, start_symbol, sparse=False):
+    """Interna los símbolos de una tabla LL(1) (dict de dicts) y la aplana en un array.
+
+    Con `sparse` la tabla plana se entrega comprimida (ver SparseLL1Table).
+    """
+    non_terminals = list(table)
+    terminals = list(TOKEN_KINDS)
+    known = set(terminals)
+    productions = []
+    production_index = {}
+    for nt in non_terminals:
+        for terminal, production in table[nt].items():
+            for symbol in [terminal, *production]:
+                if symbol not in known and symbol not in table and symbol != TOKEN_EPSILON:
+                    known.add(symbol)
+                    terminals.append(symbol)
+            key = (nt, tuple(production))
+            if key not in production_index:
+                production_index[key] = len(productions)
+                productions.append((nt, production))
+
+    symbols = terminals + non_terminals
+    symbol_id = {name: i for i, name in enumerate(symbols)}
+    n_terminals = len(terminals)
+    stride = n_terminals + 1
+    flat = array('h' if len(productions) < 2 ** 15 else 'i', [-1]) * (len(non_terminals) * stride)
+    for nt in non_terminals:
+        row = (symbol_id[nt] - n_terminals) * stride
+        for terminal, production in table[nt].items():
+            flat[row + symbol_id[terminal]] = production_index[(nt, tuple(production))]
+    if sparse:
+        flat = compress_table(flat, stride)
+    return CompiledGrammar(symbols, n_terminals, symbol_id[start_symbol], flat, productions)
+
 # --- MOTOR DEL PARSER LL(1) ---
+class ParseError(Exception):
+    """Error de sintaxis con el símbolo esperado y el token (tipo y posición) encontrado."""
+    def __init__(self, message, expected=None, token=None):
+        super().__init__(message)
+        self.expected = expected
+        self.token = token
+        self.found = token.type if token is not None else None
+        self.pos = token.pos if token is not None else None
+        # Los completa parse_with_recovery()
+        self.line = None
+        self.column = None
+
+def syntax_error(grammar, top, token):
+    """ParseError para la cima `top` (id en la gramática compilada) que no acepta `token`."""
+    expected = grammar.symbols[top]
+    if top < grammar.n_terminals:
+        message = f"Error de sintaxis: Se esperaba '{expected}' pero se encontró '{token.type}'"
+    else:
+        message = f"Error de sintaxis: No hay regla para [{expected}, {token.type}]"
+    return ParseError(message, expected, token)
+
+# Acciones de la traza: ('match', terminal) o ('rule', no_terminal, producción)
+ACTION_MATCH = 'match'
+ACTION_RULE = 'rule'
+
+def format_trace_header():
+    return [f"{'PILA':<40} | {'TOKEN ACTUAL':<15} | ACCIÓN", "-" * 70]
+
+def format_trace_event(stack, token, action):
+    """Da formato de tabla a un evento (pila, token, acción) de la traza."""
+    if action[0] == ACTION_MATCH:
+        description = f"Match: {action[1]}"
+    else:
+        description = f"Regla: {action[1]} -> {' '.join(action[2])}"
+    return f"{str(stack):<40} | {token.type:<15} | {description}"
+
+def print_trace(stack, token, action):
+    print(format_trace_event(stack, token, action))
+
+# Máximo de errores que informa parse_with_recovery() por defecto
+MAX_ERRORS = 100
+
+class LineIndex:
+    """Offsets donde empieza cada línea de un texto; convierte offset en (línea, columna) con bisect."""
+    def __init__(self, text):
+        starts = [0]
+        find = text.find
+        newline = find('\n')
+        while newline >= 0:
+            starts.append(newline + 1)
+            newline = find('\n', newline + 1)
+        self.starts = starts
+
+    def line_col(self, pos):
+        line = bisect_right(self.starts, pos)
+        return line, pos - self.starts[line - 1] + 1
+
 class LL1Parser:
     def __init__(self, table, lexer, start_symbol):
-        self.table = table
+        # Acepta la tabla legible (dict de dicts) o una CompiledGrammar ya preparada
+        if not isinstance(table, CompiledGrammar):
+            table = compile_grammar(table, start_symbol)
+        self.grammar = table
         self.lexer = lexer
         self.start_symbol = start_symbol
-        self.current_token = self.lexer.get_next_token()
-        self.stack = []
-        self.stack.append(TOKEN_EOF)      
-        self.stack.append(self.start_symbol) 
-
-    def parse(self):
-        print("--- INICIANDO ANÁLISIS SINTÁCTICO (Motor LL(1)) ---")
-        print(f"{'PILA':<40} | {'TOKEN ACTUAL':<15} | ACCIÓN")
-        print("-" * 70)
-        
+        # Un error léxico en el primer token se guarda: parse() lo lanza y
+        # parse_with_recovery() lo registra y continúa
+        self.pending_error = None
+        try:
+            self.current_token = self.lexer.get_next_token()
+        except LexerError as e:
+            self.pending_error = e
+            self.current_token = None
+        # La pila guarda ids de símbolos, no nombres
+        self.stack = [self.grammar.eof, self.grammar.start]
+
+    def error(self, top, token):
+        self.current_token = token
+        return syntax_error(self.grammar, top, token)
+
+    def parse(self, trace=None, metrics=None):
+        """Analiza la entrada completa; devuelve True o lanza ParseError.
+
+        Si se entrega `trace`, se llama como trace(pila, token, acción) en cada paso.
+        Con `metrics` (metricas.ParseMetrics) se usa el ciclo instrumentado.
+        Sin ninguno de los dos se usa un ciclo que solo trabaja con enteros.
+        """
+        if self.pending_error is not None:
+            raise self.pending_error
+        if trace is not None:
+            return self.parse_traced(trace)
+        if metrics is not None:
+            return metrics.observe(self)
+        if isinstance(self.lexer, TokenBuffer) and self.grammar.uses_token_kinds:
+            return self.parse_buffer()
+
+        grammar = self.grammar
+        n_terminals, stride = grammar.n_terminals, grammar.stride
+        table, rhs = grammar.table, grammar.rhs
+        kind_of = grammar.terminal_id.get
+        unknown = grammar.unknown
+        stack = self.stack
+        pop, push, extend = stack.pop, stack.append, stack.extend
+        next_token = self.lexer.get_next_token
+        token = self.current_token
+        kind = kind_of(token.type, unknown)
+        while stack:
+            top = pop()
+            # Caso 1: Cima es Terminal o EOF
+            if top < n_terminals:
+                if top != kind:
+                    push(top)
+                    raise self.error(top, token)
+                token = next_token()
+                kind = kind_of(token.type, unknown)
+            # Caso 2: Cima es No-Terminal
+            else:
+                production = table[(top - n_terminals) * stride + kind]
+                if production < 0:
+                    push(top)
+                    raise self.error(top, token)
+                extend(rhs[production])
+        self.current_token = token
+        return True
+
+    def parse_buffer(self):
+        """Variante de parse() que lee los tipos directamente del array de un TokenBuffer."""
+        grammar = self.grammar
+        n_terminals, stride = grammar.n_terminals, grammar.stride
+        table, rhs = grammar.table, grammar.rhs
+        stack = self.stack
+        pop, push, extend = stack.pop, stack.append, stack.extend
+        tokens = self.lexer
+        kinds = tokens.kinds
+        last = len(kinds) - 1
+        i = tokens.cursor - 1  # El token actual ya fue leído en __init__
+        kind = kinds[i]
+        while stack:
+            top = pop()
+            if top < n_terminals:
+                if top != kind:
+                    push(top)
+                    tokens.cursor = i + 1
+                    raise self.error(top, tokens[i])
+                if i < last:
+                    i += 1
+                    kind = kinds[i]
+            else:
+                production = table[(top - n_terminals) * stride + kind]
+                if production < 0:
+                    push(top)
+                    tokens.cursor = i + 1
+                    raise self.error(top, tokens[i])
+                extend(rhs[production])
+        tokens.cursor = i + 1
+        self.current_token = tokens[i]
+        return True
+
+    def parse_ast(self):
+        """Como parse(), pero devuelve el AST de la expresión construido en la misma pasada."""
+        grammar = self.grammar
+        if not grammar.uses_token_kinds:
+            raise ValueError("parse_ast() requiere una gramática sobre los tokens del Lexer")
+        if self.pending_error is not None:
+            raise self.pending_error
+        n_terminals, stride = grammar.n_terminals, grammar.stride
+        table, rhs = grammar.table, grammar.ast_rhs
+        kind_of = grammar.terminal_id.get
+        unknown = grammar.unknown
+        stack = self.stack
+        pop, push, extend = stack.pop, stack.append, stack.extend
+        operands = []
+        next_token = self.lexer.get_next_token
+        token = self.current_token
+        kind = kind_of(token.type, unknown)
+        while stack:
+            top = pop()
+            # Marca de operador: combina los dos últimos operandos
+            if top < 0:
+                right = operands.pop()
+                operands[-1] = BinaryNode(AST_OPERATORS[-1 - top], operands[-1], right)
+            elif top < n_terminals:
+                if top != kind:
+                    push(top)
+                    raise self.error(top, token)
+                if kind == KIND_NUM:
+                    operands.append(NumberNode(token.value))
+                elif kind == KIND_ID:
+                    operands.append(VariableNode(token.lexeme))
+                token = next_token()
+                kind = kind_of(token.type, unknown)
+            else:
+                production = table[(top - n_terminals) * stride + kind]
+                if production < 0:
+                    push(top)
+                    raise self.error(top, token)
+                extend(rhs[production])
+        self.current_token = token
+        if not operands:
+            raise ValueError("La gramática aceptó la entrada sin producir ninguna expresión")
+        return operands[-1]
+
+    def parse_traced(self, trace):
+        grammar = self.grammar
+        symbols = grammar.symbols
         while self.stack:
-            top_of_stack = self.stack[-1]
-            token_type = self.current_token.type
-            
-            stack_str = str(self.stack)
-            
+            top = self.stack[-1]
+            token = self.current_token
+            kind = grammar.kind_of(token.type)
+            snapshot = list(map(symbols.__getitem__, self.stack))
+
             # Caso 1: Cima es Terminal o EOF
-            if top_of_stack in TERMINALS or top_of_stack == TOKEN_EOF:
-                if top_of_stack == token_type:
-                    print(f"{stack_str:<40} | {token_type:<15} | Match: {token_type}")
-                    self.stack.pop()
-                    self.current_token = self.lexer.get_next_token()
-                else:
-                    raise Exception(f"Error de sintaxis: Se esperaba '{top_of_stack}' pero se encontró '{token_type}'")
-            
+            if top < grammar.n_terminals:
+                if top != kind:
+                    raise self.error(top, token)
+                trace(snapshot, token, (ACTION_MATCH, token.type))
+                self.stack.pop()
+                self.current_token = self.lexer.get_next_token()
+
             # Caso 2: Cima es No-Terminal
-            elif top_of_stack in NON_TERMINALS:
-                try:
-                    production = self.table[top_of_stack][token_type]
-                    print(f"{stack_str:<40} | {token_type:<15} | Regla: {top_of_stack} -> {' '.join(production)}")
-                    self.stack.pop()
-                    if production != [TOKEN_EPSILON]:
-                        for symbol in reversed(production):
-                            self.stack.append(symbol)
-                except KeyError:
-                    raise Exception(f"Error de sintaxis: No hay regla para [{top_of_stack}, {token_type}]")
             else:
-                raise Exception(f"Símbolo desconocido en la pila: {top_of_stack}")
+                production = grammar.table[(top - grammar.n_terminals) * grammar.stride + kind]
+                if production < 0:
+                    raise self.error(top, token)
+                nt, symbols_of_production = grammar.productions[production]
+                trace(snapshot, token, (ACTION_RULE, nt, symbols_of_production))
+                self.stack.pop()
+                self.stack.extend(grammar.rhs[production])
 
-        print("-" * 70)
         return True
 
+    def parse_steps(self, index=None):
+        """Pasos del análisis sobre un TokenBuffer, sin formatear nada.
+
+        Genera (índice de token, producción o None si es un match) antes de aplicar cada
+        paso; en ese momento self.stack tiene la pila previa. Con `index` (y self.stack
+        ya asignada) se retoma un análisis desde ese token. Lanza el mismo ParseError que parse().
+        """
+        grammar = self.grammar
+        tokens = self.lexer
+        if not isinstance(tokens, TokenBuffer) or not grammar.uses_token_kinds:
+            raise ValueError("parse_steps() requiere un TokenBuffer y una gramática sobre los tokens del Lexer")
+        if self.pending_error is not None:
+            raise self.pending_error
+        n_terminals, stride = grammar.n_terminals, grammar.stride
+        table, rhs = grammar.table, grammar.rhs
+        stack = self.stack
+        pop, extend = stack.pop, stack.extend
+        kinds = tokens.kinds
+        last = len(kinds) - 1
+        i = tokens.cursor - 1 if index is None else index
+        while stack:
+            top = stack[-1]
+            kind = kinds[i]
+            if top < n_terminals:
+                if top != kind:
+                    tokens.cursor = i + 1
+                    raise self.error(top, tokens[i])
+                yield i, None
+                pop()
+                if i < last:
+                    i += 1
+            else:
+                production = table[(top - n_terminals) * stride + kind]
+                if production < 0:
+                    tokens.cursor = i + 1
+                    raise self.error(top, tokens[i])
+                yield i, production
+                pop()
+                extend(rhs[production])
+        tokens.cursor = i + 1
+        self.current_token = tokens[i]
+
+    def parse_instrumented(self, metrics):
+        """Como parse(), pero acumula en `metrics` las producciones usadas, los tokens
+        consumidos por tipo, la profundidad máxima de la pila y el tiempo del lexer."""
+        grammar = self.grammar
+        n_terminals, stride = grammar.n_terminals, grammar.stride
+        table, rhs = grammar.table, grammar.rhs
+        kind_of = grammar.terminal_id.get
+        unknown = grammar.unknown
+        production_counts = metrics.production_counts
+        token_counts = metrics.token_counts
+        max_depth = metrics.max_stack_depth
+        lexer_seconds = 0.0
+        stack = self.stack
+        pop, push, extend = stack.pop, stack.append, stack.extend
+        next_token = self.lexer.get_next_token
+        token = self.current_token
+        kind = kind_of(token.type, unknown)
+        try:
+            while stack:
+                top = pop()
+                if top < n_terminals:
+                    if top != kind:
+                        push(top)
+                        raise self.error(top, token)
+                    token_counts[kind] += 1
+                    start = perf_counter()
+                    token = next_token()
+                    lexer_seconds += perf_counter() - start
+                    kind = kind_of(token.type, unknown)
+                else:
+                    production = table[(top - n_terminals) * stride + kind]
+                    if production < 0:
+                        push(top)
+                        raise self.error(top, token)
+                    production_counts[production] += 1
+                    extend(rhs[production])
+                    if len(stack) > max_depth:
+                        max_depth = len(stack)
+        finally:
+            metrics.max_stack_depth = max_depth
+            metrics.lexer_seconds += lexer_seconds
+        self.current_token = token
+        return True
+
+    def parse_with_recovery(self, follow_sets, max_errors=MAX_ERRORS):
+        """Analiza toda la entrada sin detenerse en el primer error (modo pánico).
+
+        Devuelve la lista de errores (ParseError y LexerError, con .line y .column) en
+        orden; vacía si la entrada es correcta. Se detiene al juntar max_errors.
+        Recuperación: si falta un terminal se da por insertado; si un no-terminal no
+        tiene regla para el token, se descartan tokens hasta uno con regla o que esté
+        en su Follow (y entonces se quita el no-terminal de la pila); si sobra entrada
+        al final, se sigue analizando como otra expresión. Hasta el siguiente match
+        no se informan nuevos errores, para no repetir el mismo.
+        """
+        grammar = self.grammar
+        n_terminals, stride, table, rhs = grammar.n_terminals, grammar.stride, grammar.table, grammar.rhs
+        kind_of = grammar.kind_of
+        eof = grammar.eof
+        # Conjuntos de sincronización en ids
+        follow = {grammar.symbol_id[nt]: frozenset(grammar.terminal_id[t] for t in terminals if t in grammar.terminal_id)
+                  for nt, terminals in follow_sets.items() if nt in grammar.symbol_id}
+        errors = []
+        positions = []
+
+        def line_col(pos):
+            # El índice de líneas se arma recién con el primer error
+            if not positions:
+                if isinstance(self.lexer, (Lexer, TokenBuffer)):
+                    positions.append(LineIndex(self.lexer.text).line_col)
+                else:
+                    positions.append(getattr(self.lexer, 'line_col', None))
+            return positions[0](pos) if positions[0] and pos is not None else (None, None)
+
+        def next_token():
+            # Los errores léxicos se registran y el lexer continúa tras el caracter inválido
+            while True:
+                try:
+                    return self.lexer.get_next_token()
+                except LexerError as e:
+                    errors.append(e)
+                    if len(errors) >= max_errors:
+                        return Token(TOKEN_EOF, None, e.pos)
+
+        stack = self.stack
+        token = self.current_token
+        if self.pending_error is not None:
+            errors.append(self.pending_error)
+            self.pending_error = None
+            token = next_token()
+        kind = kind_of(token.type)
+        recovering = False
+        while stack and len(errors) < max_errors:
+            top = stack[-1]
+            if top < n_terminals:
+                if top == kind:
+                    stack.pop()
+                    recovering = False
+                    if top != eof:
+                        token = next_token()
+                        kind = kind_of(token.type)
+                    continue
+            else:
+                production = table[(top - n_terminals) * stride + kind]
+                if production >= 0:
+                    stack.pop()
+                    stack.extend(rhs[production])
+                    continue
+            if not recovering:
+                error = self.error(top, token)
+                error.line, error.column = line_col(token.pos)
+                errors.append(error)
+                recovering = True
+            if top < n_terminals and top != eof:
+                # Terminal faltante: se da por insertado
+                stack.pop()
+            elif top >= n_terminals and (kind == eof or kind in follow.get(top, ())):
+                # El token puede seguir al no-terminal: se abandona el no-terminal
+                stack.pop()
+            else:
+                # Token que no encaja en ninguna parte: se descarta
+                token = next_token()
+                kind = kind_of(token.type)
+                if top == eof and kind != eof:
+                    # Sobra entrada tras una expresión completa: se analiza como una
+                    # nueva expresión para seguir encontrando errores en el resto
+                    stack.append(grammar.start)
+        self.current_token = token
+        return errors
+
 # --- UTILIDADES DE ARCHIVO ---
-def read_source_file(filename):
+def ensure_source_file(filename):
     # Crea el archivo si no existe para facilitar la prueba
     if not os.path.exists(filename):
         with open(filename, 'w', encoding='utf-8') as f:
             f.write("(valor1 + 100) * 2 % 5 - otra_variable / 3")
-    
+
+def read_source_file(filename):
+    ensure_source_file(filename)
     with open(filename, 'r', encoding='utf-8') as f:
         return f.read()
 
+@contextmanager
+def open_source_stream(filename, use_mmap=False, chunk_size=CHUNK_SIZE):
+    """Abre el archivo como StreamLexer, leyendo por bloques del archivo o de un mmap."""
+    ensure_source_file(filename)
+    with open(filename, 'rb') as f:
+        # mmap no admite archivos vacíos
+        if use_mmap and os.path.getsize(filename) > 0:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                yield StreamLexer(mapped, chunk_size)
+        else:
+            yield StreamLexer(f, chunk_size)
+
 def write_to_file(data, filename):
     print(f"Generando archivo: {filename}")
-    data_serializable = json.loads(json.dumps(data, default=list))
     with open(filename, 'w', encoding='utf-8') as f:
-        json.dump(data_serializable, f, indent=4)
+        json.dump(data, f, indent=4, default=list)
+
+# --- CACHÉ DE LA GRAMÁTICA COMPILADA ---
+# Cambiar GENERATOR_VERSION invalida las entradas de caché de versiones anteriores.
+GENERATOR_VERSION = 1
+CACHE_DIR = '.ll1_cache'
+ARTIFACT_FILES = {
+    'grammar': "resultado_gramatica.json",
+    'first_sets': "resultado_conjunto_first.json",
+    'follow_sets': "resultado_conjunto_follow.json",
+    'table': "resultado_tabla_sintactica.json",
+}
+
+class GrammarTables:
+    """First, Follow, tabla LL(1) legible y gramática compilada de una gramática."""
+    def __init__(self, grammar, first_sets, follow_sets, table, compiled, from_cache=False):
+        self.grammar = grammar
+        self.first_sets = first_sets
+        self.follow_sets = follow_sets
+        self.table = table
+        self.compiled = compiled
+        self.from_cache = from_cache
+
+def grammar_fingerprint(grammar, start_symbol):
+    """Hash del contenido de la gramática, el símbolo inicial y la versión del generador."""
+    payload = json.dumps([grammar, start_symbol, GENERATOR_VERSION], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+def build_grammar_tables(grammar, start_symbol, log=None):
+    """Calcula First, Follow, la tabla LL(1) y su versión compilada."""
+    if log:
+        log("[Calculando First...]")
+    first_sets = calculate_first_sets(grammar, set(grammar))
+    if log:
+        log("[Calculando Follow...]")
+    follow_sets = calculate_follow_sets(grammar, start_symbol, first_sets)
+    if log:
+        log("[Generando Tabla LL(1)...]")
+    table = build_ll1_table(grammar, first_sets, follow_sets)
+    return GrammarTables(grammar, first_sets, follow_sets, table, compile_grammar(table, start_symbol))
+
+def write_cache_file(path, tables):
+    """Guarda las tablas como una línea JSON seguida de arrays binarios.
+
+    No se usa pickle: cargar la caché nunca ejecuta código, aunque otro haya escrito
+    `.ll1_cache/`. La tabla legible no se guarda completa (repetiría cada producción
+    en cada casilla): se reconstruye desde la tabla compilada y el orden de los
+    terminales de cada fila, para que los JSON generados no cambien de orden.
+    """
+    compiled = tables.compiled
+    order = array('i')
+    row_sizes = []
+    for nt in compiled.symbols[compiled.n_terminals:]:
+        row = tables.table[nt]
+        order.extend(compiled.symbol_id[terminal] for terminal in row)
+        row_sizes.append(len(row))
+    header = {
+        'first_sets': {nt: sorted(symbols) for nt, symbols in tables.first_sets.items()},
+        'follow_sets': {nt: sorted(symbols) for nt, symbols in tables.follow_sets.items()},
+        'symbols': compiled.symbols,
+        'n_terminals': compiled.n_terminals,
+        'start': compiled.start,
+        'productions': compiled.productions,
+        'typecode': compiled.table.typecode,
+        'cells': len(compiled.table),
+        'row_sizes': row_sizes,
+        'byteorder': sys.byteorder,
+    }
+    # Escritura atómica: un proceso concurrente nunca ve un archivo a medias
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(json.dumps(header, ensure_ascii=False).encode('utf-8') + b"\n")
+            f.write(compiled.table.tobytes())
+            f.write(order.tobytes())
+        os.replace(tmp_path, path)
+    except OSError:
+        # Disco lleno o sin permisos: no se deja el temporal a medias
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+def read_cache_file(path, grammar):
+    """GrammarTables desde un archivo de write_cache_file(); ValueError si no es válido."""
+    with open(path, 'rb') as f:
+        header = json.loads(f.readline())
+        data = f.read()
+    if header['byteorder'] != sys.byteorder or header['typecode'] not in ('h', 'i'):
+        raise ValueError("Caché incompatible")
+    table = array(header['typecode'])
+    table_bytes = header['cells'] * table.itemsize
+    table.frombytes(data[:table_bytes])
+    order = array('i')
+    order.frombytes(data[table_bytes:])
+    row_sizes = header['row_sizes']
+    if len(table) != header['cells'] or len(order) != sum(row_sizes):
+        raise ValueError("Caché incompleta")
+    productions = [(nt, production) for nt, production in header['productions']]
+    compiled = CompiledGrammar(header['symbols'], header['n_terminals'], header['start'], table, productions)
+
+    # Tabla legible: mismas listas de producción que la compilada, en el orden original
+    symbols, stride = compiled.symbols, compiled.stride
+    readable = {}
+    position = 0
+    for row, nt in enumerate(symbols[compiled.n_terminals:]):
+        base = row * stride
+        terminals = order[position:position + row_sizes[row]]
+        position += row_sizes[row]
+        readable[nt] = {symbols[terminal]: productions[table[base + terminal]][1] for terminal in terminals}
+    first_sets = {nt: set(symbols) for nt, symbols in header['first_sets'].items()}
+    follow_sets = {nt: set(symbols) for nt, symbols in header['follow_sets'].items()}
+    return GrammarTables(grammar, first_sets, follow_sets, readable, compiled, from_cache=True)
+
+def write_artifacts(tables):
+    write_to_file(tables.grammar, ARTIFACT_FILES['grammar'])
+    write_to_file(tables.first_sets, ARTIFACT_FILES['first_sets'])
+    write_to_file(tables.follow_sets, ARTIFACT_FILES['follow_sets'])
+    write_to_file(tables.table, ARTIFACT_FILES['table'])
+
+def load_grammar_tables(grammar=GRAMMAR, start_symbol=START_SYMBOL, cache_dir=CACHE_DIR, regenerate=False, log=None,
+                        write_json=True):
+    """Devuelve las tablas de la gramática, usando la caché en disco si está vigente.
+
+    La caché se indexa por grammar_fingerprint(); con `regenerate` se ignora y se recalcula.
+    Los JSON legibles solo se reescriben si no corresponden a la gramática actual o si se pide
+    (nunca con write_json=False).
+    """
+    key = grammar_fingerprint(grammar, start_symbol)
+    cache_path = os.path.join(cache_dir, f"{key}.tables")
+    tables = None
+    if not regenerate:
+        try:
+            tables = read_cache_file(cache_path, grammar)
+            if log:
+                log(f"[Tablas cargadas desde la caché: {cache_path}]")
+        except (OSError, ValueError, KeyError, TypeError, IndexError, AttributeError):
+            # Caché ausente, dañada o de otro formato: se recalcula
+            tables = None
+    if tables is None:
+        tables = build_grammar_tables(grammar, start_symbol, log)
+        # La caché es solo una optimización: si no se puede escribir, se sigue sin ella
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            write_cache_file(cache_path, tables)
+        except OSError as e:
+            if log:
+                log(f"[No se pudo escribir la caché {cache_path}: {e}]")
+
+    if not write_json:
+        return tables
+    stamp_path = os.path.join(cache_dir, 'artifacts.stamp')
+    try:
+        with open(stamp_path, 'r', encoding='utf-8') as f:
+            stale = f.read() != key
+    except OSError:
+        stale = True
+    if regenerate or stale or not all(os.path.exists(name) for name in ARTIFACT_FILES.values()):
+        write_artifacts(tables)
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            with open(stamp_path, 'w', encoding='utf-8') as f:
+                f.write(key)
+        except OSError:
+            # Sin la marca, la próxima carga solo vuelve a escribir los JSON
+            pass
+    return tables
+
+# --- GRAMÁTICAS EXTERNAS ---
+# Sobre este tamaño de tabla plana (en casillas), Grammar.compile() prueba la tabla comprimida
+SPARSE_THRESHOLD = 1 << 16
+
+class Grammar:
+    """Gramática autocontenida: producciones, símbolo inicial, terminales y no-terminales.
+
+    Las producciones tienen la misma forma que resultado_gramatica.json:
+    {"A": [["x", "B"], ["ε"]], ...}. Todo símbolo que no es no-terminal ni epsilon es terminal.
+    """
+    def __init__(self, productions, start_symbol=None):
+        if not isinstance(productions, dict) or not productions:
+            raise ValueError("La gramática debe ser un objeto no vacío {no_terminal: [producciones]}")
+        for nt, alternatives in productions.items():
+            if not isinstance(alternatives, list) or not all(
+                    isinstance(production, list) and production and all(isinstance(symbol, str) for symbol in production)
+                    for production in alternatives):
+                raise ValueError(f"Producciones inválidas para '{nt}': se esperaba una lista de listas de símbolos")
+        self.productions = productions
+        self.start_symbol = start_symbol if start_symbol is not None else next(iter(productions))
+        if self.start_symbol not in productions:
+            raise ValueError(f"El símbolo inicial '{self.start_symbol}' no es un no-terminal de la gramática")
+        self.non_terminals = set(productions)
+        self.terminals = {symbol for alternatives in productions.values() for production in alternatives
+                          for symbol in production if symbol not in productions and symbol != TOKEN_EPSILON}
+        self.terminals.add(TOKEN_EOF)
+
+    @classmethod
+    def from_json(cls, text, start_symbol=None):
+        return cls(json.loads(text), start_symbol)
+
+    @classmethod
+    def from_bnf(cls, text, start_symbol=None):
+        """Lee líneas 'A -> x B | y | ε' (símbolos separados por espacios, '#' comenta)."""
+        productions = {}
+        for number, line in enumerate(text.splitlines(), 1):
+            line = line.split('#', 1)[0].strip()
+            if not line:
+                continue
+            head, arrow, body = line.partition('->')
+            head = head.strip()
+            if not arrow or not head or ' ' in head:
+                raise ValueError(f"Línea {number}: se esperaba 'NoTerminal -> alternativas'")
+            for alternative in body.split('|'):
+                symbols = alternative.split() or [TOKEN_EPSILON]
+                productions.setdefault(head, []).append(symbols)
+        return cls(productions, start_symbol)
+
+    @classmethod
+    def from_file(cls, filename, start_symbol=None):
+        """Carga un archivo .json (forma de resultado_gramatica.json) o de texto BNF."""
+        with open(filename, 'r', encoding='utf-8') as f:
+            text = f.read()
+        if filename.endswith('.json'):
+            return cls.from_json(text, start_symbol)
+        return cls.from_bnf(text, start_symbol)
+
+    def first_sets(self):
+        return calculate_first_sets(self.productions, self.non_terminals)
+
+    def follow_sets(self, first_sets=None):
+        return calculate_follow_sets(self.productions, self.start_symbol, first_sets or self.first_sets())
+
+    def ll1_table(self):
+        first_sets = self.first_sets()
+        return build_ll1_table(self.productions, first_sets, self.follow_sets(first_sets))
+
+    def tables(self, cache_dir=CACHE_DIR):
+        """First, Follow y tablas desde la caché en disco (sin tocar los JSON del proyecto)."""
+        return load_grammar_tables(self.productions, self.start_symbol, cache_dir, write_json=False)
+
+    def compile(self, sparse=None, default_reduction=False):
+        """Gramática compilada.
+
+        Por defecto, si la tabla plana es grande, se comprime y se usa la versión
+        comprimida solo cuando ocupa menos. Sin reducción por defecto las filas casi
+        llenas de una tabla LL(1) apenas se comprimen; con `default_reduction` la
+        tabla se reduce mucho más, pero los errores se detectan más tarde (ver
+        SparseLL1Table). `sparse=True` comprime siempre; `sparse=False`, nunca.
+        """
+        compiled = self.tables().compiled
+        flat = compiled.table
+        if sparse is False or (sparse is None and len(flat) <= SPARSE_THRESHOLD):
+            return compiled
+        table = compress_table(flat, compiled.stride, default_reduction)
+        if sparse or table.nbytes() < len(flat) * flat.itemsize:
+            compiled.table = table
+        return compiled
 
 # --- EJECUCIÓN PRINCIPAL ---
 if __name__ == '__main__':
+    arg_parser = argparse.ArgumentParser(description="Analizador Sintáctico LL(1) para expresiones aritméticas")
+    arg_parser.add_argument('archivo', nargs='?', default="mi_codigo.java", help="Archivo de entrada")
+    arg_parser.add_argument('--stream', action='store_true', help="Leer la entrada por bloques en lugar de cargarla completa")
+    arg_parser.add_argument('--mmap', action='store_true', help="Leer la entrada por bloques desde un mmap (implica --stream)")
+    arg_parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE, help="Tamaño de bloque en bytes para --stream/--mmap")
+    arg_parser.add_argument('--sin-traza', action='store_true', help="No imprimir la traza paso a paso del parser")
+    arg_parser.add_argument('--gramatica', help="Gramática externa (.json con la forma de resultado_gramatica.json, o texto BNF)")
+    arg_parser.add_argument('--recuperar', action='store_true', help="No detenerse en el primer error: informar todos los errores en una pasada")
+    arg_parser.add_argument('--max-errores', type=int, default=MAX_ERRORS, help="Máximo de errores a informar con --recuperar")
+    arg_parser.add_argument('--regenerar', action='store_true', help="Recalcular las tablas y reescribir los JSON aunque la caché esté vigente")
+    args = arg_parser.parse_args()
+
     print("=========================================")
     print("      PROYECTO 01 - COMPILADORES         ")
     print("=========================================")
 
-    # 1. Guardar Gramática
-    write_to_file(GRAMMAR, "resultado_gramatica.json")
-
-    # 2. Generar Conjuntos First
-    print("\n[Calculando First...]")
-    first_sets = calculate_first_sets(GRAMMAR, NON_TERMINALS)
-    write_to_file(first_sets, "resultado_conjunto_first.json")
-
-    # 3. Generar Conjuntos Follow
-    print("[Calculando Follow...]")
-    follow_sets = calculate_follow_sets(GRAMMAR, START_SYMBOL, first_sets)
-    write_to_file(follow_sets, "resultado_conjunto_follow.json")
-
-    # 4. Generar Tabla Sintáctica
-    print("[Generando Tabla LL(1)...]")
-    ll1_table = {}
+    # 1-4. Gramática, First, Follow y Tabla LL(1) (desde la caché si está vigente)
+    print()
     try:
-        ll1_table = build_ll1_table(GRAMMAR, first_sets, follow_sets)
-        write_to_file(ll1_table, "resultado_tabla_sintactica.json")
+        grammar = Grammar.from_file(args.gramatica) if args.gramatica else Grammar(GRAMMAR, START_SYMBOL)
+        tables = load_grammar_tables(grammar.productions, grammar.start_symbol, regenerate=args.regenerar, log=print)
+        compiled_grammar = tables.compiled
     except Exception as e:
         print(f"Error Crítico: {e}")
         exit()
 
     # 5. Ejecutar Parser
     print("\n[Ejecutando Parser con archivo de entrada...]")
-    input_filename = "mi_codigo.java"
-    input_text = read_source_file(input_filename)
-    print(f"Entrada leída: {input_text}\n")
+    if args.stream or args.mmap:
+        # La entrada se lee por bloques mientras el parser avanza
+        print(f"Entrada por bloques ({'mmap' if args.mmap else 'archivo'}): {args.archivo}\n")
+        source = open_source_stream(args.archivo, use_mmap=args.mmap, chunk_size=args.chunk_size)
+    else:
+        input_text = read_source_file(args.archivo)
+        print(f"Entrada leída: {input_text}\n")
+        source = nullcontext(Lexer(input_text))
 
-    lexer = Lexer(input_text)
-    parser = LL1Parser(ll1_table, lexer, START_SYMBOL)
+    with source as lexer:
+        parser = LL1Parser(compiled_grammar, lexer, grammar.start_symbol)
 
-    try:
-        if parser.parse():
-            print("\n>>> RESULTADO: El código es SINTÁCTICAMENTE CORRECTO. <<<")
-    except Exception as e:
-        print(f"\n>>> RESULTADO: ERROR DE SINTAXIS: {e} <<<")
\ No newline at end of file
+        try:
+            if args.recuperar:
+                # Una sola pasada que junta todos los errores (la traza no aplica)
+                errors = parser.parse_with_recovery(tables.follow_sets, args.max_errores)
+                for error in errors:
+                    print(f"Línea {error.line}, columna {error.column}: {error}")
+                if len(errors) >= args.max_errores:
+                    print(f"(se alcanzó el máximo de {args.max_errores} errores)")
+                if errors:
+                    raise ParseError(f"{len(errors)} error(es) encontrados")
+                accepted = True
+            elif args.sin_traza:
+                accepted = parser.parse()
+            else:
+                print("--- INICIANDO ANÁLISIS SINTÁCTICO (Motor LL(1)) ---")
+                print("\n".join(format_trace_header()))
+                accepted = parser.parse(trace=print_trace)
+                print("-" * 70)
+            if accepted:
+                print("\n>>> RESULTADO: El código es SINTÁCTICAMENTE CORRECTO. <<<")
+        except Exception as e:
+            print(f"\n>>> RESULTADO: ERROR DE SINTAXIS: {e} <<<")
@@ -0,0 +1,254 @@
+import argparse
+import asyncio
+import json
+import math
+import os
+import signal
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import evaluador
+import lote
+import proyecto_final as backend
+
+# -------------------------------------------------
+# Servidor de análisis residente
+# Carga la gramática compilada una sola vez y atiende peticiones JSON, una por
+# línea, por un socket Unix o TCP local. Cada conexión puede enviar varias
+# peticiones sin esperar respuesta (pipelining); las respuestas salen en el
+# mismo orden. Si un cliente no lee sus respuestas, el servidor deja de leer
+# sus peticiones (contrapresión) en lugar de acumularlas en memoria. Los textos
+# cortos se analizan en el propio ciclo de eventos; los largos, en procesos de
+# trabajo (--procesos) o en un hilo, con a lo más --concurrencia a la vez.
+#
+# Petición:  {"id": 1, "op": "validate" | "parse" | "evaluate" | "stats", "text": "...", "env": {...}}
+# Respuesta: {"id": 1, "ok": true, ...} o {"id": 1, "ok": false, "error": "...", "pos": ..., ...}
+# -------------------------------------------------
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+MAX_CONCURRENCY = 64        # Peticiones largas en proceso a la vez (todas las conexiones)
+MAX_PIPELINE = 128          # Respuestas pendientes por conexión antes de dejar de leer
+MAX_LINE = 16 * 1024 * 1024 # Largo máximo de una petición
+# Textos hasta este largo se atienden en el propio ciclo de eventos; los más largos
+# se envían a los procesos de trabajo (o a un hilo) para no bloquear las demás conexiones
+INLINE_CHARS = 4096
+
+def init_worker():
+    """Inicializador de los procesos de trabajo: carga la gramática compilada una vez."""
+    evaluador.get_compiled_grammar()
+
+def ast_to_rpn(node):
+    """AST en notación posfija: números, nombres de variable y operadores.
+
+    Una lista plana se serializa sin recursión, aunque el árbol sea muy profundo.
+    """
+    output = []
+    pending = [node]
+    while pending:
+        node = pending.pop()
+        if isinstance(node, backend.BinaryNode):
+            pending.append(node.op)
+            pending.append(node.right)
+            pending.append(node.left)
+        elif isinstance(node, backend.NumberNode):
+            output.append(node.value)
+        elif isinstance(node, backend.VariableNode):
+            output.append(node.name)
+        else:
+            output.append(node)
+    return output
+
+def handle_request(request):
+    """Atiende una petición ya decodificada y devuelve la respuesta (sin el id)."""
+    op = request.get('op')
+    text = request.get('text')
+    if op not in ('validate', 'parse', 'evaluate'):
+        return {'ok': False, 'error': f"Operación desconocida: {op!r}"}
+    if not isinstance(text, str):
+        return {'ok': False, 'error': "Falta el campo 'text'"}
+    try:
+        if op == 'validate':
+            error = lote.check_text(text, evaluador.get_compiled_grammar())
+            if error is not None:
+                return {'ok': False, **lote.error_fields(error, text)}
+            return {'ok': True}
+        if op == 'parse':
+            return {'ok': True, 'rpn': ast_to_rpn(evaluador.parse_expression(text))}
+        env = request.get('env') or {}
+        if not isinstance(env, dict):
+            return {'ok': False, 'error': "El campo 'env' debe ser un objeto JSON"}
+        for name, env_value in env.items():
+            # bool es subclase de int, pero true/false no son valores numéricos
+            if isinstance(env_value, bool) or not isinstance(env_value, (int, float)):
+                return {'ok': False, 'error': f"La variable {name!r} debe ser un número, no {env_value!r}"}
+        value = evaluador.compile_expression(text)(env)
+        if isinstance(value, float) and not math.isfinite(value):
+            # JSON no admite Infinity ni NaN
+            return {'ok': False, 'error': f"Resultado no finito: {value}"}
+        return {'ok': True, 'value': value}
+    except (backend.LexerError, backend.ParseError) as e:
+        return {'ok': False, **lote.error_fields(e, text)}
+    except (NameError, ArithmeticError, TypeError) as e:
+        return {'ok': False, 'error': str(e)}
+
+class ParseServer:
+    def __init__(self, workers=0, concurrency=MAX_CONCURRENCY, pipeline=MAX_PIPELINE):
+        # La gramática y la caché de expresiones se cargan antes de aceptar conexiones
+        evaluador.get_compiled_grammar()
+        # Sin procesos, los textos largos van al ThreadPoolExecutor por defecto del ciclo (executor None)
+        self.executor = ProcessPoolExecutor(workers, initializer=init_worker) if workers else None
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.pipeline = pipeline
+        self.started = time.time()
+        self.connections = 0
+        self.requests = 0
+        self.errors = 0
+        self.in_flight = 0
+
+    def stats(self):
+        return {
+            'ok': True,
+            'uptime': round(time.time() - self.started, 3),
+            'connections': self.connections,
+            'requests': self.requests,
+            'errors': self.errors,
+            'in_flight': self.in_flight,
+            # Caché de este proceso: cubre las peticiones cortas, no las que atienden los procesos de trabajo
+            'cache': evaluador.expression_cache.stats(),
+        }
+
+    async def process(self, line):
+        """Decodifica una línea, la atiende y devuelve la respuesta como dict."""
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError("la petición debe ser un objeto JSON")
+        except ValueError as e:
+            self.errors += 1
+            return {'id': None, 'ok': False, 'error': f"JSON inválido: {e}"}
+        self.requests += 1
+        if request.get('op') == 'stats':
+            response = self.stats()
+        else:
+            text = request.get('text')
+            try:
+                if not isinstance(text, str) or len(text) <= INLINE_CHARS:
+                    # Las expresiones cortas se analizan más rápido aquí que enviándolas a otro hilo o proceso
+                    response = handle_request(request)
+                else:
+                    # El semáforo limita cuántas peticiones largas se procesan a la vez
+                    async with self.semaphore:
+                        self.in_flight += 1
+                        try:
+                            loop = asyncio.get_running_loop()
+                            response = await loop.run_in_executor(self.executor, handle_request, request)
+                        finally:
+                            self.in_flight -= 1
+            except Exception as e:
+                response = {'ok': False, 'error': f"Error interno: {type(e).__name__}: {e}"}
+        self.errors += not response['ok']
+        return {'id': request.get('id'), **response}
+
+    async def handle_connection(self, reader, writer):
+        self.connections += 1
+        # Respuestas en orden de llegada; la cola acotada frena la lectura si el cliente no lee
+        pending = asyncio.Queue(self.pipeline)
+        sender = asyncio.create_task(self.send_responses(writer, pending))
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    # Línea más larga que MAX_LINE: se responde el error y se corta la conexión
+                    await pending.put(asyncio.create_task(self.oversized()))
+                    break
+                if not line:
+                    break
+                if line.strip():
+                    await pending.put(asyncio.create_task(self.process(line)))
+        except ConnectionError:
+            pass
+        finally:
+            await pending.put(None)
+            try:
+                await sender
+            finally:
+                writer.close()
+
+    async def oversized(self):
+        self.errors += 1
+        return {'id': None, 'ok': False, 'error': f"Petición demasiado larga (máximo {MAX_LINE} bytes)"}
+
+    async def send_responses(self, writer, pending):
+        try:
+            while True:
+                task = await pending.get()
+                if task is None:
+                    return
+                response = None
+                try:
+                    response = await task
+                    # ensure_ascii escapa también los surrogates sueltos que puedan venir en un mensaje de error
+                    line = json.dumps(response, allow_nan=False).encode('ascii')
+                except Exception as e:
+                    # Una respuesta fallida no debe dejar sin respuesta a las siguientes
+                    self.errors += 1
+                    request_id = response.get('id') if isinstance(response, dict) else None
+                    response = {'id': request_id, 'ok': False, 'error': f"Error interno: {type(e).__name__}: {e}"}
+                    line = json.dumps(response).encode('ascii')
+                writer.write(line + b"\n")
+                # Si el cliente no lee, drain() espera y la cola de pendientes se llena
+                await writer.drain()
+        except ConnectionError:
+            # El cliente se fue: se descartan las respuestas que quedaban
+            while True:
+                task = await pending.get()
+                if task is None:
+                    return
+                task.cancel()
+
+    async def serve(self, host=DEFAULT_HOST, port=DEFAULT_PORT, socket_path=None):
+        if socket_path:
+            if os.path.exists(socket_path):
+                os.unlink(socket_path)
+            server = await asyncio.start_unix_server(self.handle_connection, socket_path, limit=MAX_LINE)
+            address = socket_path
+        else:
+            server = await asyncio.start_server(self.handle_connection, host, port, limit=MAX_LINE)
+            address = f"{host}:{port}"
+        print(f"Servidor LL(1) escuchando en {address}", flush=True)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            if self.executor is not None:
+                self.executor.shutdown(cancel_futures=True)
+            if socket_path and os.path.exists(socket_path):
+                os.unlink(socket_path)
+
+# --- EJECUCIÓN PRINCIPAL ---
+if __name__ == '__main__':
+    arg_parser = argparse.ArgumentParser(description="Servidor residente de análisis LL(1) (JSON por líneas)")
+    arg_parser.add_argument('--socket', help="Ruta de un socket Unix (por defecto, TCP local)")
+    arg_parser.add_argument('--host', default=DEFAULT_HOST, help="Dirección TCP")
+    arg_parser.add_argument('--port', type=int, default=DEFAULT_PORT, help="Puerto TCP")
+    arg_parser.add_argument('--procesos', type=int, default=0, help="Procesos de trabajo (0 = analizar en el propio servidor)")
+    arg_parser.add_argument('--concurrencia', type=int, default=MAX_CONCURRENCY, help="Peticiones en proceso a la vez")
+    arg_parser.add_argument('--pipeline', type=int, default=MAX_PIPELINE, help="Respuestas pendientes por conexión")
+    args = arg_parser.parse_args()
+
+    async def main():
+        server = ParseServer(args.procesos, args.concurrencia, args.pipeline)
+        serving = asyncio.create_task(server.serve(args.host, args.port, args.socket))
+        # SIGTERM cierra el servidor igual que Ctrl+C (y borra el socket)
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, serving.cancel)
+        try:
+            await serving
+        except asyncio.CancelledError:
+            pass
+
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,71 @@
+import random
+import unittest
+
+import evaluador
+import verificador
+
+# -------------------------------------------------
+# Pruebas del verificador incremental
+# Tras cada edición aleatoria, el IncrementalChecker actualizado debe dar los
+# mismos tokens y errores que uno nuevo construido sobre el texto completo.
+# Uso: python -m unittest test_verificador  (o python -m pytest -q)
+# -------------------------------------------------
+
+# Trozos que se insertan: tokens válidos, paréntesis sueltos, espacios, saltos de línea e inválidos
+SNIPPETS = ['a', 'valor1', '12', '3.5', '+', '-', '*', '/', '(', ')', ' ', '\n', '  \n ',
+            '(a + 1)', ' * (2 - b)', '#', '@', '))', '((', 'x) + (y']
+
+def checker_state(checker):
+    errors = [(type(e).__name__, str(e), e.pos) for e in checker.errors()]
+    return list(checker.tokens()), errors
+
+def random_edit(rng, text):
+    """Inserta, borra o reemplaza un tramo corto en una posición al azar."""
+    start = rng.randrange(len(text) + 1)
+    end = min(len(text), start + rng.choice([0, 0, 1, 2, 5, 20]))
+    insert = ''.join(rng.choice(SNIPPETS) for _ in range(rng.choice([0, 1, 1, 2, 4])))
+    return text[:start] + insert + text[end:]
+
+class IncrementalCheckerTest(unittest.TestCase):
+    def setUp(self):
+        self.grammar = evaluador.get_compiled_grammar()
+        # Bloques pequeños: muchos puntos de control aun con textos cortos
+        self.block_tokens = verificador.BLOCK_TOKENS
+        verificador.BLOCK_TOKENS = 8
+
+    def tearDown(self):
+        verificador.BLOCK_TOKENS = self.block_tokens
+
+    def assert_same_as_full_check(self, checker, text):
+        self.assertEqual(checker_state(checker), checker_state(verificador.IncrementalChecker(self.grammar, text)),
+                         msg=repr(text))
+
+    def test_random_edits_match_full_check(self):
+        rng = random.Random(1234)
+        for _ in range(30):
+            text = ' + '.join(rng.choice(['(a * 2)', 'b', '(1 - (c / 3))', '4']) for _ in range(rng.randrange(1, 40)))
+            checker = verificador.IncrementalChecker(self.grammar, text)
+            for _ in range(100):
+                text = random_edit(rng, text)
+                checker.update(text)
+                self.assert_same_as_full_check(checker, text)
+
+    def test_edit_far_from_the_end_reuses_blocks(self):
+        text = ' + '.join(['(a * 2)'] * 2000)
+        checker = verificador.IncrementalChecker(self.grammar, text)
+        total = checker.relexed
+        text = text[:105] + '3' + text[106:]  # un número por otro: la pila no cambia
+        checker.update(text)
+        self.assertLess(checker.relexed, total // 10)
+        self.assert_same_as_full_check(checker, text)
+
+    def test_unbalanced_parenthesis_reported_until_fixed(self):
+        checker = verificador.IncrementalChecker(self.grammar, '(a + 1) * 2')
+        self.assertEqual(checker.errors(), [])
+        checker.update('(a + 1 * 2')
+        self.assertEqual(len(checker.errors()), 1)
+        checker.update('(a + 1) * 2')
+        self.assertEqual(checker.errors(), [])
+
+if __name__ == '__main__':
+    unittest.main()
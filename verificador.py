@@ -0,0 +1,235 @@
+from array import array
+from bisect import bisect_left
+from operator import attrgetter
+
+import proyecto_final as backend
+
+# -------------------------------------------------
+# Verificación incremental para el editor
+# Los tokens se guardan en bloques; cada bloque recuerda la pila del parser
+# antes de su primer token. Tras una edición solo se vuelve a tokenizar y
+# analizar desde el bloque anterior al cambio hasta el primer bloque posterior
+# donde los tokens y la pila coinciden con los de antes: desde ahí el
+# resultado es el mismo y los bloques se reutilizan desplazando su offset.
+# -------------------------------------------------
+
+BLOCK_TOKENS = 256      # Tokens por bloque (cada bloque es un punto de control)
+COMPARE_CHUNK = 4096    # Caracteres por comparación al buscar la zona editada
+MAX_ERRORS = 100
+# Código de token para un caracter inválido: el parser lo salta y se informa como error léxico
+KIND_ERROR = 255
+KIND_ERROR_BYTE = bytes([KIND_ERROR])
+
+class TokenBlock:
+    """Tokens consecutivos con offsets relativos a `start` y la pila del parser antes del primero.
+
+    `stack` es None si el análisis ya había fallado antes del bloque.
+    """
+    __slots__ = ('start', 'kinds', 'starts', 'ends', 'stack')
+
+    def __init__(self, start, stack):
+        self.start = start
+        self.kinds = bytearray()
+        self.starts = array('I')
+        self.ends = array('I')
+        self.stack = stack
+
+def common_prefix(a, b):
+    """Largo del prefijo común, comparando por trozos."""
+    n = min(len(a), len(b))
+    i = 0
+    while i < n and a[i:i + COMPARE_CHUNK] == b[i:i + COMPARE_CHUNK]:
+        i += COMPARE_CHUNK
+    end = min(i + COMPARE_CHUNK, n)
+    while i < end and a[i] == b[i]:
+        i += 1
+    return min(i, n)
+
+def common_suffix(a, b, limit):
+    """Largo del sufijo común, sin pasar de `limit` caracteres."""
+    la, lb = len(a), len(b)
+    i = 0
+    while i + COMPARE_CHUNK <= limit and a[la - i - COMPARE_CHUNK:la - i] == b[lb - i - COMPARE_CHUNK:lb - i]:
+        i += COMPARE_CHUNK
+    while i < limit and a[la - i - 1] == b[lb - i - 1]:
+        i += 1
+    return i
+
+def shifted_error(error, delta):
+    """Copia de un ParseError con la posición del token desplazada."""
+    token = error.token
+    return backend.ParseError(str(error), error.expected, backend.Token(token.type, token.lexeme, token.pos + delta))
+
+class IncrementalChecker:
+    """Verificador sintáctico que se actualiza con el texto completo tras cada edición.
+
+    update(texto) localiza la zona cambiada comparando con el texto anterior y
+    reanaliza solo lo necesario. errors() entrega los errores léxicos y el primer
+    error sintáctico, ordenados por posición.
+    """
+    def __init__(self, compiled, text=''):
+        if not compiled.uses_token_kinds:
+            raise ValueError("IncrementalChecker requiere una gramática sobre los tokens del Lexer")
+        self.grammar = compiled
+        self.text = ''
+        self.blocks = []
+        self.syntax_error = None
+        self.line_index = None  # LineIndex del texto actual; se crea al informar un error léxico
+        self.relexed = 0    # Tokens reanalizados en la última actualización
+        self.scan(text, 0, (compiled.eof, compiled.start), [], [], len(text), 0, None)
+
+    def update(self, text):
+        """Aplica el nuevo contenido; devuelve False si no cambió."""
+        old = self.text
+        if text == old:
+            return False
+        prefix = common_prefix(old, text)
+        suffix = common_suffix(old, text, min(len(old), len(text)) - prefix)
+        new_end = len(text) - suffix
+        delta = len(text) - len(old)
+        blocks = self.blocks
+        # Se retoma desde el último bloque cuyo primer token empieza antes de la edición:
+        # los tokens anteriores no cambian, pero ese podría extenderse (ab -> abc)
+        i = bisect_left(blocks, prefix, key=attrgetter('start')) - 1
+        if i < 0:
+            self.scan(text, 0, (self.grammar.eof, self.grammar.start), [], blocks, new_end, delta, self.syntax_error)
+            return True
+        restart = blocks[i]
+        self.scan(text, restart.start, restart.stack, blocks[:i], blocks[i + 1:], new_end, delta, self.syntax_error)
+        return True
+
+    def scan(self, text, begin, stack, kept, candidates, new_end, delta, old_error):
+        """Tokeniza y analiza desde `begin` con la pila `stack`.
+
+        Se detiene en el primer bloque viejo de `candidates` (offsets anteriores a la
+        edición) que, pasada la zona editada, empieza en un token del texto nuevo y
+        tiene la misma pila; ese bloque y los siguientes se conservan.
+        """
+        grammar = self.grammar
+        n_terminals, stride, table, rhs = grammar.n_terminals, grammar.stride, grammar.table, grammar.rhs
+        if stack is None:
+            # El análisis ya falló antes de `begin`: solo se tokeniza, el error se mantiene
+            error = old_error
+        else:
+            stack = list(stack)
+            pop, push, extend = stack.pop, stack.append, stack.extend
+            error = None
+        end = len(text)
+        while end and text[end - 1].isspace():
+            end -= 1
+        blocks = kept
+        block = None
+        j = 0
+        relexed = 0
+        for match in backend.TOKEN_PATTERN.finditer(text, begin, end):
+            group = match.lastindex
+            start = match.start(group)
+            if start >= new_end and j < len(candidates):
+                # ¿Se reencontró un bloque viejo con la misma pila?
+                while j < len(candidates) and candidates[j].start + delta < start:
+                    j += 1
+                if j < len(candidates) and candidates[j].start + delta == start:
+                    state = tuple(stack) if stack is not None else None
+                    if candidates[j].stack == state:
+                        tail = candidates[j:]
+                        for old_block in tail:
+                            old_block.start += delta
+                        if stack is not None and old_error is not None:
+                            # El error viejo estaba más adelante: solo cambia de posición
+                            error = shifted_error(old_error, delta)
+                        self.finish(text, blocks + tail, error, relexed)
+                        return
+            if group == backend.GROUP_OP:
+                kind = backend.OPERATOR_KINDS[text[start]]
+            elif group == backend.GROUP_ID:
+                kind = backend.KIND_ID
+            elif group == backend.GROUP_NUM:
+                kind = backend.KIND_NUM
+            else:
+                kind = KIND_ERROR
+            if block is None or len(block.kinds) == BLOCK_TOKENS:
+                block = TokenBlock(start, tuple(stack) if stack is not None else None)
+                blocks.append(block)
+            block.kinds.append(kind)
+            block.starts.append(start - block.start)
+            block.ends.append(match.end() - block.start)
+            relexed += 1
+            if stack is None or kind == KIND_ERROR:
+                continue
+            # Un paso del parser LL(1): expandir hasta consumir el token
+            while True:
+                top = pop()
+                if top < n_terminals:
+                    if top != kind:
+                        push(top)
+                        error = self.token_error(top, kind, text, start, match.end())
+                        stack = None
+                    break
+                production = table[(top - n_terminals) * stride + kind]
+                if production < 0:
+                    push(top)
+                    error = self.token_error(top, kind, text, start, match.end())
+                    stack = None
+                    break
+                extend(rhs[production])
+        if stack is not None:
+            # Fin de la entrada: el parser tiene que aceptar EOF
+            eof = grammar.eof
+            while stack:
+                top = pop()
+                if top < n_terminals:
+                    if top != eof:
+                        push(top)
+                        error = self.token_error(top, eof, text, end, end)
+                    break
+                production = table[(top - n_terminals) * stride + eof]
+                if production < 0:
+                    push(top)
+                    error = self.token_error(top, eof, text, end, end)
+                    break
+                extend(rhs[production])
+        self.finish(text, blocks, error, relexed)
+
+    def token_error(self, top, kind, text, start, end):
+        token_type = backend.TOKEN_KINDS[kind]
+        lexeme = text[start:end] if token_type != backend.TOKEN_EOF else None
+        return backend.syntax_error(self.grammar, top, backend.Token(token_type, lexeme, start))
+
+    def finish(self, text, blocks, error, relexed):
+        self.text = text
+        self.blocks = blocks
+        self.syntax_error = error
+        self.line_index = None
+        self.relexed = relexed
+
+    def tokens(self):
+        """(tipo, inicio, fin) de todos los tokens, con offsets absolutos (para comprobaciones)."""
+        for block in self.blocks:
+            base = block.start
+            for kind, start, end in zip(block.kinds, block.starts, block.ends):
+                yield kind, base + start, base + end
+
+    def lexer_errors(self, limit=MAX_ERRORS):
+        """LexerError de los caracteres inválidos, en orden (como mucho `limit`)."""
+        errors = []
+        text = self.text
+        for block in self.blocks:
+            i = block.kinds.find(KIND_ERROR_BYTE)
+            while i >= 0:
+                if len(errors) >= limit:
+                    return errors
+                pos = block.start + block.starts[i]
+                if self.line_index is None:
+                    self.line_index = backend.LineIndex(text)
+                line, column = self.line_index.line_col(pos)
+                errors.append(backend.LexerError(text[pos], pos, line, column))
+                i = block.kinds.find(KIND_ERROR_BYTE, i + 1)
+        return errors
+
+    def errors(self, limit=MAX_ERRORS):
+        """Errores léxicos y el error sintáctico (si hay), ordenados por posición."""
+        errors = self.lexer_errors(limit)
+        if self.syntax_error is not None:
+            errors.append(self.syntax_error)
+            errors.sort(key=attrgetter('pos'))
+        return errors[:limit]